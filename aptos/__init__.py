@@ -4,13 +4,15 @@ Equivalent to Hyperliquid SDK but for Aptos
 """
 
 from .api import AptosAPI
-from .info import AptosInfo
+from .info import AptosInfo, PoolInfo, TxnDetails
 from .exchange import AptosExchange
 
 __all__ = [
     "AptosAPI",
     "AptosInfo", 
-    "AptosExchange"
+    "AptosExchange",
+    "PoolInfo",
+    "TxnDetails"
 ]
 
 __version__ = "1.0.0"
@@ -5,27 +5,54 @@ Equivalent to Hyperliquid's api.py but for Aptos blockchain
 
 import asyncio
 import logging
+import random
 from typing import Optional
 
+import httpx
 from aptos_sdk.async_client import RestClient
 
 logger = logging.getLogger(__name__)
 
+
+def _is_retryable(error: Exception) -> bool:
+    """Transient transport failures and 5xx responses are worth retrying"""
+    if isinstance(error, (asyncio.TimeoutError, ConnectionError, httpx.TransportError)):
+        return True
+    status = getattr(error, "status_code", None)
+    if status is None:
+        # httpx.HTTPStatusError carries the status on its response
+        status = getattr(getattr(error, "response", None), "status_code", None)
+    return (status or 0) >= 500
+
 class AptosAPI:
     """
     Base API class for Aptos blockchain interactions
     """
     
-    def __init__(self, node_url: Optional[str] = None):
-        self.node_url = node_url or "https://fullnode.testnet.aptoslabs.com/v1"
-        self.client = RestClient(self.node_url)
+    # Retries for idempotent read calls
+    RPC_MAX_RETRIES = 2
+    
+    def __init__(self, node_url: Optional[str] = None, client: Optional[RestClient] = None):
+        self.node_url = node_url or getattr(client, "base_url", None) or "https://fullnode.testnet.aptoslabs.com/v1"
+        # Reuse an existing client (and its connection pool) when given one
+        self.client = client or RestClient(self.node_url)
         
         logger.info(f"Initialized Aptos API with node: {self.node_url}")
     
+    async def _with_retry(self, func, *args, **kwargs):
+        """Call an idempotent client method, retrying transient failures with jittered backoff"""
+        for attempt in range(self.RPC_MAX_RETRIES + 1):
+            try:
+                return await func(*args, **kwargs)
+            except Exception as e:
+                if attempt == self.RPC_MAX_RETRIES or not _is_retryable(e):
+                    raise
+                await asyncio.sleep(random.uniform(0, 0.05 * 2 ** (attempt + 1)))
+    
     async def get_ledger_info(self):
         """Get current ledger information"""
         try:
-            return await self.client.info()  # Correct method name
+            return await self._with_retry(self.client.info)  # Correct method name
         except Exception as e:
             logger.error(f"Error getting ledger info: {e}")
             return None
@@ -33,7 +60,7 @@ class AptosAPI:
     async def get_account_info(self, address: str):
         """Get account information"""
         try:
-            return await self.client.account(address)  # Correct method name
+            return await self._with_retry(self.client.account, address)  # Correct method name
         except Exception as e:
             logger.error(f"Error getting account info for {address}: {e}")
             return None
@@ -41,7 +68,7 @@ class AptosAPI:
     async def get_account_resources(self, address: str):
         """Get account resources"""
         try:
-            return await self.client.account_resources(address)
+            return await self._with_retry(self.client.account_resources, address)
         except Exception as e:
             logger.error(f"Error getting account resources for {address}: {e}")
             return []
@@ -49,7 +76,7 @@ class AptosAPI:
     async def get_account_transactions(self, address: str, limit: int = 100):
         """Get account transactions"""
         try:
-            return await self.client.transactions_by_account(address, limit=limit)
+            return await self._with_retry(self.client.transactions_by_account, address, limit=limit)
         except Exception as e:
             logger.error(f"Error getting transactions for {address}: {e}")
             return []
@@ -57,7 +84,7 @@ class AptosAPI:
     async def get_transaction_by_hash(self, txn_hash: str):
         """Get transaction by hash"""
         try:
-            return await self.client.transaction_by_hash(txn_hash)
+            return await self._with_retry(self.client.transaction_by_hash, txn_hash)
         except Exception as e:
             logger.error(f"Error getting transaction {txn_hash}: {e}")
             return None
@@ -78,6 +105,10 @@ class AptosAPI:
             logger.error(f"Error simulating transaction: {e}")
             return None
     
+    async def get_bulk(self, coros):
+        """Run independent API coroutines concurrently; exceptions are returned in place"""
+        return await asyncio.gather(*coros, return_exceptions=True)
+    
     async def estimate_gas_price(self):
         """Estimate current gas price"""
         try:
@@ -6,15 +6,21 @@ Equivalent to Hyperliquid's exchange.py but for Aptos blockchain
 import json
 import logging
 import asyncio
+import sys
 import time
+import random
+import functools
 import aiohttp
+import numpy as np
+from cachetools import TTLCache
 from typing import Dict, List, Optional, Any, Tuple
-from decimal import Decimal
 
 from aptos_sdk.async_client import RestClient, ApiError
 from aptos_sdk.account import Account
 from aptos_sdk.transactions import (
     EntryFunction,
+    RawTransaction,
+    SignedTransaction,
     TransactionArgument,
     TransactionPayload,
     Serializer,
@@ -25,14 +31,108 @@ from aptos_sdk.bcs import Serializer as BCSSerializer
 from .api import AptosAPI
 from .info import AptosInfo
 
+# Prefer a C JSON decoder for aggregator responses
+try:
+    import orjson as _fast_json
+except ImportError:
+    try:
+        import ujson as _fast_json
+    except ImportError:
+        _fast_json = json
+
+# Numba is optional - without it the vectorized kernels run as plain NumPy
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    
+    def njit(*args, **kwargs):
+        def decorator(func):
+            return func
+        return decorator
+
 logger = logging.getLogger(__name__)
 
+# Integer scales for slippage (basis points) and prices
+SLIPPAGE_BPS_DENOM = 10_000
+PRICE_SCALE = 10 ** 12
+
+# Powers of ten for common coin decimals
+_POW10 = tuple(10 ** i for i in range(19))
+# Magnitude at which a float no longer fits in int64
+_INT64_LIMIT = float(2 ** 63)
+
+# Resource type prefix for coin balances
+_COINSTORE_PREFIX = "0x1::coin::CoinStore<"
+_COINSTORE_PREFIX_LEN = len(_COINSTORE_PREFIX)
+
+# Read-only default for responses without quotes
+_EMPTY_QUOTE: Dict[str, Any] = {}
+
+
+@functools.lru_cache(maxsize=256)
+def _make_type_tag(coin_type: str) -> TypeTag:
+    """Parse a coin type string into a TypeTag once and reuse it"""
+    return TypeTag(StructTag.from_str(coin_type))
+
+
+@njit(cache=True, fastmath=True)
+def _min_output_vec(amounts: np.ndarray, prices: np.ndarray, slippage: float, is_buy: bool) -> np.ndarray:
+    """Minimum outputs for a batch of orders after slippage"""
+    factor = 1.0 - slippage
+    if is_buy:
+        return (amounts / prices * factor).astype(np.int64)
+    return (amounts * prices * factor).astype(np.int64)
+
+
+@functools.lru_cache(maxsize=32)
+def _normalize_dex(name: str) -> str:
+    """Canonical (lower-case) DEX name"""
+    return name.lower()
+
+
+def _min_output(amount: int, price: float, slippage: float, is_buy: bool) -> int:
+    """
+    Slippage-adjusted minimum output in integer arithmetic
+    Buy: amount is quote in, price is quote per base. Sell: amount is base in.
+    """
+    bps = round(slippage * SLIPPAGE_BPS_DENOM)
+    price_scaled = int(price * PRICE_SCALE)
+    if price_scaled <= 0:
+        raise ValueError(f"No usable price for min output calculation: {price}")
+    
+    if is_buy:
+        return (amount * PRICE_SCALE * (SLIPPAGE_BPS_DENOM - bps)) // (price_scaled * SLIPPAGE_BPS_DENOM)
+    return (amount * price_scaled * (SLIPPAGE_BPS_DENOM - bps)) // (PRICE_SCALE * SLIPPAGE_BPS_DENOM)
+
+
+def _quantize_amount(amount: int, digits: int = 3) -> int:
+    """Round an amount down to `digits` significant figures (used for quote cache keys)"""
+    if amount <= 0:
+        return amount
+    scale = 10 ** max(len(str(amount)) - digits, 0)
+    return (amount // scale) * scale
+
+
+class BatchSubmissionError(Exception):
+    """A submit_many batch stopped at a failed submit; txn_hashes holds the ones already sent"""
+    
+    def __init__(self, message: str, txn_hashes: List[str]):
+        super().__init__(message)
+        self.txn_hashes = txn_hashes
+
+
 class AptosExchange(AptosAPI):
     """
     Main Aptos exchange class for trading operations
     Handles DEX interactions, order placement, and portfolio management
     """
     
+    # Serializers for transaction arguments (staticmethod keeps them unbound)
+    _SER_U64 = staticmethod(Serializer.u64)
+    _SER_STR = staticmethod(Serializer.str)
+    
     # Default slippage for market orders (5%)
     DEFAULT_SLIPPAGE = 0.05
     
@@ -41,11 +141,36 @@ class AptosExchange(AptosAPI):
     USDC_COIN_TYPE = "0xf22bede237a07e121b56d91a491eb7bcdfd1f5907926a9e58338f964a01b17fa::asset::USDC"
     USDT_COIN_TYPE = "0xf22bede237a07e121b56d91a491eb7bcdfd1f5907926a9e58338f964a01b17fa::asset::USDT"
     
+    # Pre-parsed type tags for the common pairs
+    _APT_TAG = _make_type_tag(APT_COIN_TYPE)
+    _USDC_TAG = _make_type_tag(USDC_COIN_TYPE)
+    _USDT_TAG = _make_type_tag(USDT_COIN_TYPE)
+    _PAIR_TAGS = {
+        (APT_COIN_TYPE, USDC_COIN_TYPE): [_APT_TAG, _USDC_TAG],
+        (USDC_COIN_TYPE, APT_COIN_TYPE): [_USDC_TAG, _APT_TAG],
+        (APT_COIN_TYPE, USDT_COIN_TYPE): [_APT_TAG, _USDT_TAG],
+        (USDT_COIN_TYPE, APT_COIN_TYPE): [_USDT_TAG, _APT_TAG],
+    }
+    
     # DEX contract addresses
     PANCAKESWAP_CONTRACT = "0x190d44266241744264b964a37b8f09863167a12d3e70cda39376cfb4e3561e12"
     THALA_CONTRACT = "0x48271d39d0b05bd6efca2278f22277d6fcc375504f9839fd73f74ace240861af"
     LIQUIDSWAP_CONTRACT = "0x190d44266241744264b964a37b8f09863167a12d3e70cda39376cfb4e3561e12"
     
+    # Response cache TTLs (seconds)
+    PRICE_CACHE_TTL = 0.5
+    RESERVES_CACHE_TTL = 2.0
+    PANORA_QUOTE_TTL = 1.0
+    CACHE_MAXSIZE = 1024
+    
+    # Seconds until a submitted transaction expires
+    TXN_EXPIRATION_SECS = 600
+    
+    # Panora retry / circuit breaker settings
+    PANORA_MAX_RETRIES = 2
+    PANORA_BREAKER_THRESHOLD = 5
+    PANORA_BREAKER_COOLDOWN = 30
+    
     # Sponsor integrations - DEX Aggregators
     PANORA_AGGREGATOR = "panora"  # Best price routing across all DEXs
     EKUBO_DEX = "ekubo"  # Additional AMM option
@@ -56,37 +181,129 @@ class AptosExchange(AptosAPI):
         node_url: Optional[str] = None,
         vault_address: Optional[str] = None,
         preferred_dex: str = "pancakeswap",
-        config: Dict = None
+        config: Dict = None,
+        client: Optional[RestClient] = None,
+        session: Optional[aiohttp.ClientSession] = None,
+        info: Optional[AptosInfo] = None
     ):
-        super().__init__(node_url)
+        super().__init__(node_url, client=client)
         self.account = account
         self.vault_address = vault_address
         self.preferred_dex = preferred_dex
-        self.info = AptosInfo(node_url)
+        self._preferred_dex_lc = _normalize_dex(preferred_dex)
+        self._address_str = str(self.account.address())
+        # Share our RestClient so info and exchange calls use one connection pool.
+        # An injected info client belongs to the caller, who is responsible for closing it
+        self.info = info if info is not None else AptosInfo.from_client(self.client)
+        self._owns_info = info is None
         self.config = config or {}
         
         # Gas configuration
         self.default_gas_unit_price = 100
         self.max_gas_amount = 10000
         
+        # Locally tracked transaction metadata (refreshed on submit failure)
+        self._seq_num: Optional[int] = None
+        self._chain_id: Optional[int] = None
+        self._seq_lock = asyncio.Lock()
+        self._seq_outstanding = 0
+        self._seq_stale = False
+        
         # Sponsor integrations configuration
         self.sponsor_config = self.config.get("trading", {}).get("sponsor_integrations", {})
         self.panora_enabled = self.sponsor_config.get("panora", {}).get("enabled", False)
         self.panora_api_url = self.sponsor_config.get("panora", {}).get("api_url", "https://api.panora.exchange")
         self.panora_api_key = self.sponsor_config.get("panora", {}).get("api_key", "")
         
-        # HTTP session for API calls
-        self._session = None
+        # DEX contract lookup table (static after init)
+        self._dex_contracts = {
+            "pancakeswap": self.PANCAKESWAP_CONTRACT,
+            "thala": self.THALA_CONTRACT,
+            "liquidswap": self.LIQUIDSWAP_CONTRACT,
+            "hyperion": self.sponsor_config.get("hyperion", {}).get("contract_testnet", self.PANCAKESWAP_CONTRACT)
+        }
+        self._valid_panora_dexes = frozenset(self._dex_contracts)
+        self._dex_router_modules = {
+            name: sys.intern(f"{addr}::router") for name, addr in self._dex_contracts.items()
+        }
+        
+        # Static Panora request parts
+        self._panora_url = f"{self.panora_api_url}/swap"
+        self._panora_headers = {
+            "x-api-key": self.panora_api_key,
+            "Content-Type": "application/json"
+        }
+        self._panora_payload_tpl = {"userAddress": self._address_str}
+        
+        # HTTP session for API calls (created lazily, reused for the exchange lifetime).
+        # An injected session is shared with the caller, who is responsible for closing it
+        self._session = session
+        self._owns_session = session is None
+        self._session_lock = asyncio.Lock()
+        self._http_timeout = aiohttp.ClientTimeout(total=10, connect=3)
+        
+        # Short-lived, bounded response caches, one per kind of lookup
+        self._caches: Dict[str, TTLCache] = {
+            kind: TTLCache(maxsize=self.CACHE_MAXSIZE, ttl=ttl, timer=time.monotonic)
+            for kind, ttl in (
+                ("price", self.PRICE_CACHE_TTL),
+                ("reserves", self.RESERVES_CACHE_TTL),
+                ("panora", self.PANORA_QUOTE_TTL),
+            )
+        }
         
-        logger.info(f"Initialized Aptos Exchange for account: {self.account.address()}")
+        # Panora circuit breaker state
+        self._panora_breaker = {"fails": 0, "open_until": 0.0}
+        
+        logger.info(f"Initialized Aptos Exchange for account: {self._address_str}")
         if self.panora_enabled:
             logger.info("✅ Panora DEX Aggregator ENABLED for best price routing")
     
     async def _get_session(self) -> aiohttp.ClientSession:
         """Get or create HTTP session for API calls"""
-        if self._session is None or self._session.closed:
-            self._session = aiohttp.ClientSession()
-        return self._session
+        # Fast path: no lock once the session exists
+        session = self._session
+        if session is not None and not session.closed:
+            return session
+        
+        async with self._session_lock:
+            # Re-check under the lock so concurrent callers create only one session
+            if self._session is None or self._session.closed:
+                # Connector must be built inside the running loop
+                connector = aiohttp.TCPConnector(
+                    limit=100,
+                    limit_per_host=20,
+                    ttl_dns_cache=300,
+                    keepalive_timeout=75,
+                    enable_cleanup_closed=True
+                )
+                self._session = aiohttp.ClientSession(
+                    connector=connector,
+                    timeout=self._http_timeout
+                )
+                self._owns_session = True
+            return self._session
+    
+    async def _cached(self, kind: str, key: Tuple, coro_factory):
+        """
+        Return the cached value for key from the `kind` cache, otherwise await
+        coro_factory() and cache its result. Empty results (None, 0, (0, 0))
+        are not cached so a failed lookup is retried on the next call.
+        """
+        cache = self._caches[kind]
+        result = cache.get(key)
+        if result is not None:
+            return result
+        
+        result = await coro_factory()
+        if result is not None and result != 0 and result != (0, 0):
+            cache[key] = result
+        return result
+    
+    def _invalidate_cache(self, *kinds: str):
+        """Drop all cached entries of the given kinds"""
+        for kind in kinds:
+            self._caches[kind].clear()
     
     async def _get_panora_quote(
         self,
@@ -98,117 +315,282 @@ class AptosExchange(AptosAPI):
         """
         Get best swap quote from Panora Aggregator
         Compares prices across all DEXs and returns optimal route
+        Always fetched fresh - the quote's output amount and tx data are used
+        for execution. Only the resulting price is cached (see get_panora_price)
         """
         if not self.panora_enabled:
             return {"success": False, "error": "Panora not enabled"}
         
+        if time.monotonic() < self._panora_breaker["open_until"]:
+            return {"success": False, "error": "circuit_open"}
+        
         try:
             session = await self._get_session()
-            url = f"{self.panora_api_url}/swap"
-            
-            headers = {
-                "x-api-key": self.panora_api_key,
-                "Content-Type": "application/json"
-            }
-            
-            payload = {
-                "fromToken": from_token,
-                "toToken": to_token,
-                "fromTokenAmount": str(amount),
-                "slippagePercentage": slippage * 100,
-                "userAddress": str(self.account.address())
-            }
+        except Exception as e:
+            logger.error(f"Panora quote error: {e}")
+            return {"success": False, "error": str(e)}
+        
+        payload = self._panora_payload_tpl.copy()
+        payload.update(
+            fromToken=from_token,
+            toToken=to_token,
+            fromTokenAmount=str(amount),
+            slippagePercentage=slippage * 100
+        )
+        
+        error = "unknown"
+        for attempt in range(self.PANORA_MAX_RETRIES + 1):
+            if attempt:
+                # Exponential backoff with full jitter
+                await asyncio.sleep(random.uniform(0, 0.05 * 2 ** attempt))
             
-            async with session.post(url, json=payload, headers=headers) as response:
-                if response.status == 200:
-                    data = await response.json()
+            try:
+                async with session.post(
+                    self._panora_url,
+                    json=payload,
+                    headers=self._panora_headers,
+                    timeout=self._http_timeout,
+                    raise_for_status=False
+                ) as response:
+                    if response.status == 200:
+                        data = _fast_json.loads(await response.read())
+                        
+                        # Extract quote information
+                        quotes = data.get("quotes")
+                        quote = quotes[0] if quotes else _EMPTY_QUOTE
+                        
+                        if logger.isEnabledFor(logging.DEBUG):
+                            logger.debug("🎯 Panora Quote: %s %s → %s %s", amount, from_token, quote.get('toTokenAmount', 0), to_token)
+                            logger.debug("📊 Best Route: %s", ' → '.join(quote.get('route', [])))
+                            logger.debug("💰 Price Impact: %s%%", quote.get('priceImpact', 0))
+                        
+                        result = {
+                            "success": True,
+                            "from_amount": amount,
+                            "to_amount": int(quote.get("toTokenAmount", 0)),
+                            "price_impact": float(quote.get("priceImpact", 0)),
+                            "route": quote.get("route", []),
+                            "dex_breakdown": quote.get("dexBreakdown", []),
+                            "tx_data": quote.get("txData"),
+                            "gas_estimate": quote.get("gasEstimate"),
+                            "fee_token_amount": quote.get("feeTokenAmount", 0)
+                        }
+                        if result["to_amount"] and amount > 0:
+                            self._caches["panora"][(from_token, to_token, _quantize_amount(amount))] = (
+                                result["to_amount"] / amount
+                            )
+                        self._panora_breaker["fails"] = 0
+                        return result
                     
-                    # Extract quote information
-                    quote = data.get("quotes", [{}])[0] if data.get("quotes") else {}
-                    
-                    logger.info(f"🎯 Panora Quote: {amount} {from_token} → {quote.get('toTokenAmount', 0)} {to_token}")
-                    logger.info(f"📊 Best Route: {' → '.join(quote.get('route', []))}")
-                    logger.info(f"💰 Price Impact: {quote.get('priceImpact', 0)}%")
-                    
-                    return {
-                        "success": True,
-                        "from_amount": amount,
-                        "to_amount": int(quote.get("toTokenAmount", 0)),
-                        "price_impact": float(quote.get("priceImpact", 0)),
-                        "route": quote.get("route", []),
-                        "dex_breakdown": quote.get("dexBreakdown", []),
-                        "tx_data": quote.get("txData"),
-                        "gas_estimate": quote.get("gasEstimate"),
-                        "fee_token_amount": quote.get("feeTokenAmount", 0)
-                    }
-                else:
                     error_text = await response.text()
                     logger.warning(f"Panora API error {response.status}: {error_text}")
-                    return {"success": False, "error": f"HTTP {response.status}"}
-                    
-        except Exception as e:
-            logger.error(f"Panora quote error: {e}")
-            return {"success": False, "error": str(e)}
+                    error = f"HTTP {response.status}"
+                    if response.status < 500:
+                        break
+                        
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                error = str(e) or type(e).__name__
+                logger.warning(f"Panora request failed (attempt {attempt + 1}): {error}")
+            except Exception as e:
+                logger.error(f"Panora quote error: {e}")
+                error = str(e)
+                break
+        
+        self._record_panora_failure()
+        return {"success": False, "error": error}
+    
+    async def get_panora_price(self, from_token: str, to_token: str, amount: int) -> float:
+        """
+        Indicative Panora price (output per input unit) for an amount bucket
+        Served from the cache when a quote for the same bucket is recent enough.
+        Not suitable for min_amount_out - use a fresh _get_panora_quote for that
+        """
+        key = (from_token, to_token, _quantize_amount(amount))
+        price = self._caches["panora"].get(key)
+        if price is not None:
+            return price
+        
+        quote = await self._get_panora_quote(from_token, to_token, amount)
+        if not quote.get("success") or amount <= 0:
+            return 0.0
+        return quote["to_amount"] / amount
+    
+    def _record_panora_failure(self):
+        """Count a failed quote and open the circuit after repeated failures"""
+        breaker = self._panora_breaker
+        breaker["fails"] += 1
+        if breaker["fails"] >= self.PANORA_BREAKER_THRESHOLD:
+            breaker["open_until"] = time.monotonic() + self.PANORA_BREAKER_COOLDOWN
+            logger.warning(f"Panora circuit open for {self.PANORA_BREAKER_COOLDOWN}s after {breaker['fails']} failures")
     
     def _get_dex_contract(self, dex_name: str = None) -> str:
         """Get DEX contract address"""
-        dex = dex_name or self.preferred_dex
-        contracts = {
-            "pancakeswap": self.PANCAKESWAP_CONTRACT,
-            "thala": self.THALA_CONTRACT,
-            "liquidswap": self.LIQUIDSWAP_CONTRACT,
-            "hyperion": self.sponsor_config.get("hyperion", {}).get("contract_testnet", self.PANCAKESWAP_CONTRACT)
-        }
-        return contracts.get(dex.lower(), self.PANCAKESWAP_CONTRACT)
+        dex = _normalize_dex(dex_name) if dex_name else self._preferred_dex_lc
+        return self._dex_contracts.get(dex, self.PANCAKESWAP_CONTRACT)
     
-    async def _submit_transaction(self, payload: TransactionPayload) -> str:
-        """Submit transaction to Aptos network"""
+    def _get_dex_router(self, dex_name: str = None) -> str:
+        """Get the `<contract>::router` module path for a DEX"""
+        dex = _normalize_dex(dex_name) if dex_name else self._preferred_dex_lc
+        return self._dex_router_modules.get(dex, self._dex_router_modules["pancakeswap"])
+    
+    async def _get_next_seq(self) -> int:
+        """
+        Reserve the next sequence number, fetched from chain once and then
+        tracked locally. Every reservation must be handed back with _release_seq
+        """
+        async with self._seq_lock:
+            if self._seq_stale and not self._seq_outstanding:
+                # Only refetch once nothing else holds a number from the old counter
+                self._seq_num = None
+                self._seq_stale = False
+            if self._seq_num is None:
+                self._seq_num = await self.client.account_sequence_number(self.account.address())
+            seq = self._seq_num
+            self._seq_num += 1
+            self._seq_outstanding += 1
+            return seq
+    
+    def _release_seq(self):
+        """Mark a reserved sequence number as submitted (or abandoned)"""
+        self._seq_outstanding -= 1
+    
+    async def _get_chain_id(self) -> int:
+        """Chain id, fetched once"""
+        if self._chain_id is None:
+            self._chain_id = await self.client.chain_id()
+        return self._chain_id
+    
+    async def _submit_only(self, payload: TransactionPayload, sequence_number: Optional[int] = None) -> str:
+        """
+        Build, sign and submit a transaction without waiting for confirmation
+        A sequence_number passed in must come from _get_next_seq; it is released here
+        """
+        if sequence_number is None:
+            sequence_number = await self._get_next_seq()
+        
         try:
-            # Create transaction
-            txn = await self.client.create_bcs_transaction(
-                sender=self.account,
-                payload=payload,
-                gas_unit_price=self.default_gas_unit_price,
-                max_gas_amount=self.max_gas_amount
+            # Build the raw transaction from cached metadata
+            txn = RawTransaction(
+                self.account.address(),
+                sequence_number,
+                payload,
+                self.max_gas_amount,
+                self.default_gas_unit_price,
+                int(time.time()) + self.TXN_EXPIRATION_SECS,
+                await self._get_chain_id()
             )
             
             # Sign and submit
-            signed_txn = self.account.sign(txn)
-            txn_hash = await self.client.submit_bcs_transaction(signed_txn)
+            signed_txn = SignedTransaction(txn, self.account.sign_transaction(txn))
+            return await self.client.submit_bcs_transaction(signed_txn)
+        except BaseException:
+            # Whether the node rejected the number or never saw the transaction,
+            # the local counter may now have a gap - refetch it from chain once
+            # no other submit is in flight
+            self._seq_stale = True
+            raise
+        finally:
+            self._release_seq()
+    
+    async def _confirm(self, txn_hash: str) -> str:
+        """Wait for a submitted transaction to be confirmed"""
+        await self.client.wait_for_transaction(txn_hash)
+        return txn_hash
+    
+    async def _submit_transaction(self, payload: TransactionPayload) -> str:
+        """Submit transaction to Aptos network"""
+        try:
+            txn_hash = await self._submit_only(payload)
+            await self._confirm(txn_hash)
             
-            # Wait for confirmation
-            await self.client.wait_for_transaction(txn_hash)
+            # Our own trade moved pool state - drop cached market data
+            self._invalidate_cache("price", "reserves", "panora")
             
-            logger.info(f"Transaction submitted successfully: {txn_hash}")
+            logger.debug("Transaction submitted successfully: %s", txn_hash)
             return txn_hash
             
         except Exception as e:
             logger.error(f"Transaction failed: {e}")
             raise
     
+    async def submit_many(self, payloads: List[TransactionPayload]) -> List[str]:
+        """
+        Submit several transactions back-to-back and confirm them together
+        Sequence numbers are assigned from the local counter, so
+        signing/submitting never waits on a previous confirmation.
+        Submits go out in sequence order and stop at the first failure - later
+        numbers could never execute behind the gap. The transactions already
+        sent are reported on the raised BatchSubmissionError
+        """
+        if not payloads:
+            return []
+        
+        sequence_numbers = []
+        txn_hashes = []
+        try:
+            for _ in payloads:
+                sequence_numbers.append(await self._get_next_seq())
+            
+            for i, payload in enumerate(payloads):
+                # _submit_only releases this number however it finishes
+                seq, sequence_numbers[i] = sequence_numbers[i], None
+                txn_hashes.append(await self._submit_only(payload, seq))
+        except BaseException as e:
+            # Hand back every reserved number that was never submitted
+            unsent = sum(seq is not None for seq in sequence_numbers)
+            if unsent:
+                self._seq_stale = True
+                for _ in range(unsent):
+                    self._release_seq()
+            if not isinstance(e, Exception):
+                raise
+            logger.error(f"Batch submission failed after {len(txn_hashes)} of {len(payloads)} transactions: {e}")
+            raise BatchSubmissionError(str(e), txn_hashes) from e
+        
+        try:
+            await asyncio.gather(*map(self._confirm, txn_hashes))
+        except Exception as e:
+            logger.error(f"Batch confirmation failed: {e}")
+            raise BatchSubmissionError(str(e), txn_hashes) from e
+        
+        self._invalidate_cache("price", "reserves", "panora")
+        
+        logger.debug("Submitted %d transactions", len(txn_hashes))
+        return txn_hashes
+    
     async def get_account_balance(self, coin_type: str = None) -> int:
         """Get account balance for specific coin type"""
         try:
-            from aptos_sdk.account_address import AccountAddress
             coin_type = coin_type or self.APT_COIN_TYPE
-            address_obj = AccountAddress.from_str(str(self.account.address()))
-            balance = await self.client.account_balance(address_obj, coin_type=coin_type)
+            balance = await self.client.account_balance(self.account.address(), coin_type=coin_type)
             return balance
         except Exception as e:
             logger.error(f"Error getting balance: {e}")
             return 0
     
+    async def _fetch_account_resources(self) -> List[Dict]:
+        """Fetch this account's resources, decoding the raw body with the fast JSON parser"""
+        response = await self.client.client.get(
+            f"{self.client.base_url}/accounts/{self._address_str}/resources"
+        )
+        if response.status_code == 404:
+            return []
+        if response.status_code >= 400:
+            raise ApiError(response.text, response.status_code)
+        return _fast_json.loads(response.content)
+    
     async def get_all_balances(self) -> Dict[str, int]:
         """Get all coin balances for the account"""
         try:
-            resources = await self.client.account_resources(str(self.account.address()))
+            resources = await self._fetch_account_resources()
             balances = {}
             
             for resource in resources:
-                if "CoinStore" in resource["type"]:
-                    coin_type = resource["type"].split("<")[1].split(">")[0]
-                    balance = int(resource["data"]["coin"]["value"])
-                    balances[coin_type] = balance
+                resource_type = resource["type"]
+                if not resource_type.startswith(_COINSTORE_PREFIX):
+                    continue
+                coin = resource["data"]["coin"]
+                balances[resource_type[_COINSTORE_PREFIX_LEN:-1]] = int(coin["value"])
             
             return balances
         except Exception as e:
@@ -228,28 +610,35 @@ class AptosExchange(AptosAPI):
         Equivalent to market buy/sell orders
         """
         try:
-            dex_contract = self._get_dex_contract(dex)
-            
             # Create swap transaction payload
             payload = EntryFunction.natural(
-                f"{dex_contract}::router",
+                self._get_dex_router(dex),
                 "swap_exact_input",
-                [TypeTag(StructTag.from_str(from_coin)), TypeTag(StructTag.from_str(to_coin))],
+                self._PAIR_TAGS.get((from_coin, to_coin))
+                or [_make_type_tag(from_coin), _make_type_tag(to_coin)],
                 [
-                    TransactionArgument(amount_in, Serializer.u64),
-                    TransactionArgument(min_amount_out, Serializer.u64),
+                    TransactionArgument(amount_in, self._SER_U64),
+                    TransactionArgument(min_amount_out, self._SER_U64),
                 ]
             )
             
             txn_hash = await self._submit_transaction(TransactionPayload(payload))
             
-            logger.info(f"Swap executed: {amount_in} {from_coin} -> {to_coin} on {dex}")
+            logger.info("Swap executed: %s %s -> %s on %s", amount_in, from_coin, to_coin, dex)
             return txn_hash
             
         except Exception as e:
             logger.error(f"Swap failed: {e}")
             raise
     
+    async def swap_apt_for_usdc(self, amount_in: int, min_out: int = 0, dex: str = None) -> str:
+        """Swap exact APT input for USDC using the pre-parsed type tags"""
+        return await self.swap_exact_input(self.APT_COIN_TYPE, self.USDC_COIN_TYPE, amount_in, min_out, dex)
+    
+    async def swap_usdc_for_apt(self, amount_in: int, min_out: int = 0, dex: str = None) -> str:
+        """Swap exact USDC input for APT using the pre-parsed type tags"""
+        return await self.swap_exact_input(self.USDC_COIN_TYPE, self.APT_COIN_TYPE, amount_in, min_out, dex)
+    
     async def swap_exact_output(
         self,
         from_coin: str,
@@ -262,21 +651,19 @@ class AptosExchange(AptosAPI):
         Swap for exact output amount
         """
         try:
-            dex_contract = self._get_dex_contract(dex)
-            
             payload = EntryFunction.natural(
-                f"{dex_contract}::router",
+                self._get_dex_router(dex),
                 "swap_exact_output",
-                [TypeTag(StructTag.from_str(from_coin)), TypeTag(StructTag.from_str(to_coin))],
+                [_make_type_tag(from_coin), _make_type_tag(to_coin)],
                 [
-                    TransactionArgument(amount_out, Serializer.u64),
-                    TransactionArgument(max_amount_in, Serializer.u64),
+                    TransactionArgument(amount_out, self._SER_U64),
+                    TransactionArgument(max_amount_in, self._SER_U64),
                 ]
             )
             
             txn_hash = await self._submit_transaction(TransactionPayload(payload))
             
-            logger.info(f"Exact output swap: {from_coin} -> {amount_out} {to_coin} on {dex}")
+            logger.info("Exact output swap: %s -> %s %s on %s", from_coin, amount_out, to_coin, dex)
             return txn_hash
             
         except Exception as e:
@@ -295,23 +682,21 @@ class AptosExchange(AptosAPI):
     ) -> str:
         """Add liquidity to a trading pair"""
         try:
-            dex_contract = self._get_dex_contract(dex)
-            
             payload = EntryFunction.natural(
-                f"{dex_contract}::router",
+                self._get_dex_router(dex),
                 "add_liquidity",
-                [TypeTag(StructTag.from_str(coin_a)), TypeTag(StructTag.from_str(coin_b))],
+                [_make_type_tag(coin_a), _make_type_tag(coin_b)],
                 [
-                    TransactionArgument(amount_a, Serializer.u64),
-                    TransactionArgument(amount_b, Serializer.u64),
-                    TransactionArgument(min_a, Serializer.u64),
-                    TransactionArgument(min_b, Serializer.u64),
+                    TransactionArgument(amount_a, self._SER_U64),
+                    TransactionArgument(amount_b, self._SER_U64),
+                    TransactionArgument(min_a, self._SER_U64),
+                    TransactionArgument(min_b, self._SER_U64),
                 ]
             )
             
             txn_hash = await self._submit_transaction(TransactionPayload(payload))
             
-            logger.info(f"Liquidity added: {amount_a} {coin_a} + {amount_b} {coin_b} on {dex}")
+            logger.info("Liquidity added: %s %s + %s %s on %s", amount_a, coin_a, amount_b, coin_b, dex)
             return txn_hash
             
         except Exception as e:
@@ -329,22 +714,20 @@ class AptosExchange(AptosAPI):
     ) -> str:
         """Remove liquidity from a trading pair"""
         try:
-            dex_contract = self._get_dex_contract(dex)
-            
             payload = EntryFunction.natural(
-                f"{dex_contract}::router",
+                self._get_dex_router(dex),
                 "remove_liquidity",
-                [TypeTag(StructTag.from_str(coin_a)), TypeTag(StructTag.from_str(coin_b))],
+                [_make_type_tag(coin_a), _make_type_tag(coin_b)],
                 [
-                    TransactionArgument(liquidity_amount, Serializer.u64),
-                    TransactionArgument(min_a, Serializer.u64),
-                    TransactionArgument(min_b, Serializer.u64),
+                    TransactionArgument(liquidity_amount, self._SER_U64),
+                    TransactionArgument(min_a, self._SER_U64),
+                    TransactionArgument(min_b, self._SER_U64),
                 ]
             )
             
             txn_hash = await self._submit_transaction(TransactionPayload(payload))
             
-            logger.info(f"Liquidity removed: {liquidity_amount} LP tokens from {coin_a}/{coin_b} on {dex}")
+            logger.info("Liquidity removed: %s LP tokens from %s/%s on %s", liquidity_amount, coin_a, coin_b, dex)
             return txn_hash
             
         except Exception as e:
@@ -359,14 +742,14 @@ class AptosExchange(AptosAPI):
                 "transfer",
                 [],
                 [
-                    TransactionArgument(to_address, Serializer.str),
-                    TransactionArgument(amount, Serializer.u64),
+                    TransactionArgument(to_address, self._SER_STR),
+                    TransactionArgument(amount, self._SER_U64),
                 ]
             )
             
             txn_hash = await self._submit_transaction(TransactionPayload(payload))
             
-            logger.info(f"Transferred {amount} octas to {to_address}")
+            logger.info("Transferred %s octas to %s", amount, to_address)
             return txn_hash
             
         except Exception as e:
@@ -379,16 +762,16 @@ class AptosExchange(AptosAPI):
             payload = EntryFunction.natural(
                 "0x1::coin",
                 "transfer",
-                [TypeTag(StructTag.from_str(coin_type))],
+                [_make_type_tag(coin_type)],
                 [
-                    TransactionArgument(to_address, Serializer.str),
-                    TransactionArgument(amount, Serializer.u64),
+                    TransactionArgument(to_address, self._SER_STR),
+                    TransactionArgument(amount, self._SER_U64),
                 ]
             )
             
             txn_hash = await self._submit_transaction(TransactionPayload(payload))
             
-            logger.info(f"Transferred {amount} {coin_type} to {to_address}")
+            logger.info("Transferred %s %s to %s", amount, coin_type, to_address)
             return txn_hash
             
         except Exception as e:
@@ -400,7 +783,11 @@ class AptosExchange(AptosAPI):
         try:
             # This would query the DEX for current price
             # Implementation depends on specific DEX API
-            return await self.info.get_pair_price(coin_a, coin_b, dex)
+            return await self._cached(
+                "price",
+                (coin_a, coin_b, dex),
+                lambda: self.info.get_pair_price(coin_a, coin_b, dex)
+            )
         except Exception as e:
             logger.error(f"Error getting pair price: {e}")
             return 0.0
@@ -408,7 +795,11 @@ class AptosExchange(AptosAPI):
     async def get_pair_reserves(self, coin_a: str, coin_b: str, dex: str = None) -> Tuple[int, int]:
         """Get liquidity pool reserves for a trading pair"""
         try:
-            return await self.info.get_pair_reserves(coin_a, coin_b, dex)
+            return await self._cached(
+                "reserves",
+                (coin_a, coin_b, dex),
+                lambda: self.info.get_pair_reserves(coin_a, coin_b, dex)
+            )
         except Exception as e:
             logger.error(f"Error getting pair reserves: {e}")
             return (0, 0)
@@ -439,6 +830,25 @@ class AptosExchange(AptosAPI):
             logger.error(f"Error calculating slippage price: {e}")
             return current_price or 0.0
     
+    def plan_child_orders(
+        self,
+        amounts,
+        prices,
+        slippage: float = None,
+        is_buy: bool = True
+    ) -> np.ndarray:
+        """
+        Compute min-output amounts for a batch of child orders (e.g. TWAP slices)
+        Single orders should use the scalar path in market_buy/market_sell
+        """
+        slippage = slippage or self.DEFAULT_SLIPPAGE
+        return _min_output_vec(
+            np.asarray(amounts, dtype=np.float64),
+            np.asarray(prices, dtype=np.float64),
+            float(slippage),
+            bool(is_buy)
+        )
+    
     async def market_buy(
         self,
         base_coin: str,
@@ -453,24 +863,32 @@ class AptosExchange(AptosAPI):
         If use_aggregator=True and Panora is enabled, uses aggregator for best price routing
         Returns: Dict with txn_hash and routing info
         """
+        price_task = None
         try:
             slippage = slippage or self.DEFAULT_SLIPPAGE
             
+            # Fetch the direct DEX price alongside the Panora quote so the
+            # fallback path doesn't pay for both round-trips in sequence
+            price_task = asyncio.create_task(self.get_pair_price(quote_coin, base_coin, dex))
+            
             # Try Panora aggregator first if enabled
             if use_aggregator and self.panora_enabled:
-                logger.info("🎯 Using Panora Aggregator for best price routing...")
+                logger.debug("🎯 Using Panora Aggregator for best price routing...")
                 panora_quote = await self._get_panora_quote(quote_coin, base_coin, quote_amount, slippage)
                 
                 if panora_quote.get("success"):
-                    logger.info(f"✅ Panora route: {' → '.join(panora_quote.get('route', []))} | Impact: {panora_quote.get('price_impact', 0)}%")
+                    if logger.isEnabledFor(logging.INFO):
+                        logger.info("✅ Panora route: %s | Impact: %s%%", ' → '.join(panora_quote.get('route', [])), panora_quote.get('price_impact', 0))
+                    
+                    price_task.cancel()
                     
                     # Use Panora's calculated output
                     min_output = panora_quote["to_amount"]
                     
                     # Execute swap on best DEX from route
                     if panora_quote.get("route"):
-                        best_dex = panora_quote["route"][0].lower()
-                        dex = best_dex if best_dex in ["pancakeswap", "thala", "liquidswap", "hyperion"] else dex
+                        best_dex = _normalize_dex(panora_quote["route"][0])
+                        dex = best_dex if best_dex in self._valid_panora_dexes else dex
                     
                     txn_hash = await self.swap_exact_input(
                         from_coin=quote_coin,
@@ -492,9 +910,14 @@ class AptosExchange(AptosAPI):
                 else:
                     logger.warning(f"⚠️  Panora unavailable: {panora_quote.get('error')}, using direct DEX")
             
-            # Fallback to direct DEX swap
-            current_price = await self.get_pair_price(quote_coin, base_coin, dex)
-            min_output = int(quote_amount / current_price * (1 - slippage))
+            # Fallback to direct DEX swap - price and balance are independent lookups
+            current_price, balance = await asyncio.gather(
+                price_task,
+                self.get_account_balance(quote_coin)
+            )
+            if balance < quote_amount:
+                logger.warning(f"Balance {balance} may be insufficient for quote amount {quote_amount}")
+            min_output = _min_output(quote_amount, current_price, slippage, is_buy=True)
             
             txn_hash = await self.swap_exact_input(
                 from_coin=quote_coin,
@@ -514,6 +937,9 @@ class AptosExchange(AptosAPI):
         except Exception as e:
             logger.error(f"Market buy failed: {e}")
             raise
+        finally:
+            if price_task is not None and not price_task.done():
+                price_task.cancel()
     
     async def market_sell(
         self,
@@ -529,24 +955,32 @@ class AptosExchange(AptosAPI):
         If use_aggregator=True and Panora is enabled, uses aggregator for best price routing
         Returns: Dict with txn_hash and routing info
         """
+        price_task = None
         try:
             slippage = slippage or self.DEFAULT_SLIPPAGE
             
+            # Fetch the direct DEX price alongside the Panora quote so the
+            # fallback path doesn't pay for both round-trips in sequence
+            price_task = asyncio.create_task(self.get_pair_price(base_coin, quote_coin, dex))
+            
             # Try Panora aggregator first if enabled
             if use_aggregator and self.panora_enabled:
-                logger.info("🎯 Using Panora Aggregator for best price routing...")
+                logger.debug("🎯 Using Panora Aggregator for best price routing...")
                 panora_quote = await self._get_panora_quote(base_coin, quote_coin, base_amount, slippage)
                 
                 if panora_quote.get("success"):
-                    logger.info(f"✅ Panora route: {' → '.join(panora_quote.get('route', []))} | Impact: {panora_quote.get('price_impact', 0)}%")
+                    if logger.isEnabledFor(logging.INFO):
+                        logger.info("✅ Panora route: %s | Impact: %s%%", ' → '.join(panora_quote.get('route', [])), panora_quote.get('price_impact', 0))
+                    
+                    price_task.cancel()
                     
                     # Use Panora's calculated output
                     min_output = panora_quote["to_amount"]
                     
                     # Execute swap on best DEX from route
                     if panora_quote.get("route"):
-                        best_dex = panora_quote["route"][0].lower()
-                        dex = best_dex if best_dex in ["pancakeswap", "thala", "liquidswap", "hyperion"] else dex
+                        best_dex = _normalize_dex(panora_quote["route"][0])
+                        dex = best_dex if best_dex in self._valid_panora_dexes else dex
                     
                     txn_hash = await self.swap_exact_input(
                         from_coin=base_coin,
@@ -568,9 +1002,14 @@ class AptosExchange(AptosAPI):
                 else:
                     logger.warning(f"⚠️  Panora unavailable: {panora_quote.get('error')}, using direct DEX")
             
-            # Fallback to direct DEX swap
-            current_price = await self.get_pair_price(base_coin, quote_coin, dex)
-            min_output = int(base_amount * current_price * (1 - slippage))
+            # Fallback to direct DEX swap - price and balance are independent lookups
+            current_price, balance = await asyncio.gather(
+                price_task,
+                self.get_account_balance(base_coin)
+            )
+            if balance < base_amount:
+                logger.warning(f"Balance {balance} may be insufficient for base amount {base_amount}")
+            min_output = _min_output(base_amount, current_price, slippage, is_buy=False)
             
             txn_hash = await self.swap_exact_input(
                 from_coin=base_coin,
@@ -590,20 +1029,37 @@ class AptosExchange(AptosAPI):
         except Exception as e:
             logger.error(f"Market sell failed: {e}")
             raise
+        finally:
+            if price_task is not None and not price_task.done():
+                price_task.cancel()
     
     def format_amount(self, amount: int, decimals: int = 8) -> str:
         """Format amount from smallest unit to human readable"""
-        return f"{amount / (10 ** decimals):.{decimals}f}"
+        scale = _POW10[decimals] if decimals < len(_POW10) else 10 ** decimals
+        return f"{amount / scale:.{decimals}f}"
     
     def parse_amount(self, amount: float, decimals: int = 8) -> int:
         """Parse human readable amount to smallest unit"""
-        return int(amount * (10 ** decimals))
+        scale = _POW10[decimals] if decimals < len(_POW10) else 10 ** decimals
+        return int(amount * scale)
+    
+    def parse_amounts(self, amounts, decimals: int = 8) -> np.ndarray:
+        """
+        Parse an array of human readable amounts to smallest units
+        Returns int64 when every result fits, otherwise an object array of Python ints
+        (the same values parse_amount gives) rather than silently wrapping around
+        """
+        scale = _POW10[decimals] if decimals < len(_POW10) else 10 ** decimals
+        scaled = np.asarray(amounts, dtype=np.float64) * scale
+        if np.all(np.abs(scaled) < _INT64_LIMIT):
+            return scaled.astype(np.int64)
+        return np.array([int(x) for x in scaled.ravel()], dtype=object).reshape(scaled.shape)
     
     async def get_transaction_history(self, limit: int = 100) -> List[Dict]:
         """Get transaction history for the account"""
         try:
             transactions = await self.client.account_transactions(
-                str(self.account.address()),
+                self._address_str,
                 limit=limit
             )
             return transactions
@@ -613,6 +1069,11 @@ class AptosExchange(AptosAPI):
     
     async def close(self):
         """Clean up resources"""
-        if hasattr(self.info, 'close'):
+        if self._owns_session and self._session is not None and not self._session.closed:
+            await self._session.close()
+            # Give the SSL transports a moment to shut down cleanly
+            await asyncio.sleep(0.05)
+        self._session = None
+        if self._owns_info and hasattr(self.info, 'close'):
             await self.info.close()
         logger.info("Aptos Exchange closed")
@@ -4,125 +4,359 @@ Equivalent to Hyperliquid's info.py but for Aptos blockchain
 """
 
 import asyncio
+import functools
 import logging
 import json
+import re
 import time
+from types import MappingProxyType
 from typing import Dict, List, Optional, Tuple, Any
-from decimal import Decimal
 
-import aiohttp
+import httpx
+import msgspec
+from cachetools import TTLCache
+from aptos_sdk.async_client import RestClient
 
 from .api import AptosAPI
 
+# Prefer a C JSON codec for HTTP payloads
+try:
+    import orjson as _fast_json
+except ImportError:
+    try:
+        import ujson as _fast_json
+    except ImportError:
+        _fast_json = json
+
+# simdjson is optional - used for lazy field access on indexer responses
+try:
+    import simdjson
+    SIMDJSON_AVAILABLE = True
+except ImportError:
+    SIMDJSON_AVAILABLE = False
+
+# ijson is optional - lets indexer responses be parsed while streaming
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+# h2 is optional - without it httpx falls back to HTTP/1.1
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# Coin mappings
+_COIN_TO_SYMBOL = MappingProxyType({
+    "0x1::aptos_coin::AptosCoin": "APT",
+    "0xf22bede237a07e121b56d91a491eb7bcdfd1f5907926a9e58338f964a01b17fa::asset::USDC": "USDC",
+    "0xf22bede237a07e121b56d91a491eb7bcdfd1f5907926a9e58338f964a01b17fa::asset::USDT": "USDT",
+})
+_SYMBOL_TO_COIN = MappingProxyType({v: k for k, v in _COIN_TO_SYMBOL.items()})
+
+# Indexer GraphQL endpoints by network, matched against the node URL
+_INDEXER_URLS = MappingProxyType({
+    "mainnet": "https://api.mainnet.aptoslabs.com/v1/graphql",
+    "testnet": "https://api.testnet.aptoslabs.com/v1/graphql",
+    "devnet": "https://api.devnet.aptoslabs.com/v1/graphql",
+})
+
+def _indexer_url(node_url: str) -> Optional[str]:
+    """Indexer endpoint for the node's network, or None if the network can't be told from the URL"""
+    for network, url in _INDEXER_URLS.items():
+        if f".{network}." in node_url:
+            return url
+    return None
+
+# DEX contract mappings
+_DEX_CONTRACTS = MappingProxyType({
+    "pancakeswap": "0x190d44266241744264b964a37b8f09863167a12d3e70cda39376cfb4e3561e12",
+    "thala": "0x48271d39d0b05bd6efca2278f22277d6fcc375504f9839fd73f74ace240861af",
+    "liquidswap": "0x190d44266241744264b964a37b8f09863167a12d3e70cda39376cfb4e3561e12"
+})
+
+# Substring identifying staking resource types (e.g. 0x1::stake::StakePool)
+_STAKE_MARKER = "stake"
+
+# Integer price scale (1 USD = 1_000_000 micro-USD)
+MICRO_USD = 1_000_000
+
+# Smallest-unit scale for symbols valued in portfolios (stablecoins assumed 6 decimals)
+_UNIT_SCALE = MappingProxyType({"APT": 100000000, "USDC": 1000000, "USDT": 1000000})
+
+# Extracts the coin type from a CoinStore resource type
+_COINSTORE_PREFIX = "0x1::coin::CoinStore<"
+_COINSTORE_RE = re.compile(r"0x1::coin::CoinStore<(.+)>\Z")
+
+@functools.lru_cache(maxsize=256)
+def _coin_to_symbol_impl(coin_type: str) -> str:
+    """Symbol for a coin type (the coin type itself if unknown)"""
+    return _COIN_TO_SYMBOL.get(coin_type, coin_type)
+
+
+@functools.lru_cache(maxsize=256)
+def _symbol_to_coin_impl(symbol: str) -> str:
+    """Coin type for a symbol (the symbol itself if unknown)"""
+    return _SYMBOL_TO_COIN.get(symbol, symbol)
+
+
+# Common trading pairs on Aptos
+_KNOWN_PAIRS = (
+    ("0x1::aptos_coin::AptosCoin", "0xf22bede237a07e121b56d91a491eb7bcdfd1f5907926a9e58338f964a01b17fa::asset::USDC"),
+    ("0x1::aptos_coin::AptosCoin", "0xf22bede237a07e121b56d91a491eb7bcdfd1f5907926a9e58338f964a01b17fa::asset::USDT"),
+    ("0xf22bede237a07e121b56d91a491eb7bcdfd1f5907926a9e58338f964a01b17fa::asset::USDC", "0xf22bede237a07e121b56d91a491eb7bcdfd1f5907926a9e58338f964a01b17fa::asset::USDT"),
+)
+
+
+class PoolInfo(msgspec.Struct, frozen=True):
+    """Snapshot of a DEX liquidity pool"""
+    coin_a: str
+    coin_b: str
+    reserves_a: int
+    reserves_b: int
+    price: float
+    dex: str
+    total_liquidity: int
+    timestamp: int
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain dict form for callers that expect dicts"""
+        return msgspec.structs.asdict(self)
+
+
+class TxnDetails(msgspec.Struct, frozen=True):
+    """Summary of an on-chain transaction (numeric fields are strings as returned by the node)"""
+    hash: str
+    sender: Optional[str] = None
+    sequence_number: Optional[str] = None
+    gas_used: Optional[str] = None
+    gas_unit_price: Optional[str] = None
+    success: Optional[bool] = None
+    timestamp: Optional[str] = None
+    type: Optional[str] = None
+    payload: Optional[Dict[str, Any]] = None
+    events: List[Dict[str, Any]] = msgspec.field(default_factory=list)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain dict form for callers that expect dicts"""
+        return msgspec.structs.asdict(self)
+
+
+# Indexer GraphQL documents
+BALANCE_QUERY = """
+query GetCoinBalances($owner_address: String!) {
+  current_fungible_asset_balances(
+    where: {owner_address: {_eq: $owner_address}}
+  ) {
+    amount
+    asset_type
+  }
+}
+"""
+
+PORTFOLIO_QUERY = """
+query AccountPortfolio($owner_address: String!) {
+  balances: current_fungible_asset_balances(
+    where: {owner_address: {_eq: $owner_address}}
+  ) {
+    amount
+    asset_type
+  }
+}
+"""
+
+
+def _owner_query_template(query: str) -> Tuple[bytes, bytes]:
+    """Pre-serialize a GraphQL request body around its owner_address value"""
+    marker = "__owner_address__"
+    body = json.dumps({"query": query, "variables": {"owner_address": marker}})
+    prefix, suffix = body.split(marker)
+    return prefix.encode(), suffix.encode()
+
+
+def _owner_query_body(template: Tuple[bytes, bytes], address: str) -> bytes:
+    """Fill a pre-serialized GraphQL body with an owner address"""
+    if '"' in address or "\\" in address:
+        # Not a plain hex address - needs real JSON escaping
+        return template[0] + json.dumps(address)[1:-1].encode() + template[1]
+    return template[0] + address.encode() + template[1]
+
+
+_BALANCE_QUERY_BODY = _owner_query_template(BALANCE_QUERY)
+_PORTFOLIO_QUERY_BODY = _owner_query_template(PORTFOLIO_QUERY)
+
+
 class AptosInfo(AptosAPI):
     """
     Information and market data class for Aptos blockchain
     Handles price feeds, account data, and DEX information
     """
     
-    def __init__(self, node_url: Optional[str] = None, use_hyperion: bool = True):
-        super().__init__(node_url)
-        
-        # Coin mappings
-        self.coin_to_symbol = {
-            "0x1::aptos_coin::AptosCoin": "APT",
-            "0xf22bede237a07e121b56d91a491eb7bcdfd1f5907926a9e58338f964a01b17fa::asset::USDC": "USDC",
-            "0xf22bede237a07e121b56d91a491eb7bcdfd1f5907926a9e58338f964a01b17fa::asset::USDT": "USDT",
-        }
+    def __init__(
+        self,
+        node_url: Optional[str] = None,
+        use_hyperion: bool = True,
+        client: Optional[RestClient] = None
+    ):
+        super().__init__(node_url, client=client)
         
-        self.symbol_to_coin = {v: k for k, v in self.coin_to_symbol.items()}
+        # Indexer for the same network as the node (None disables indexer lookups)
+        self.indexer_url = _indexer_url(self.node_url)
         
-        # DEX contract mappings
-        self.dex_contracts = {
-            "pancakeswap": "0x190d44266241744264b964a37b8f09863167a12d3e70cda39376cfb4e3561e12",
-            "thala": "0x48271d39d0b05bd6efca2278f22277d6fcc375504f9839fd73f74ace240861af",
-            "liquidswap": "0x190d44266241744264b964a37b8f09863167a12d3e70cda39376cfb4e3561e12"
-        }
+        # Coin and DEX mappings (shared, read-only)
+        self.coin_to_symbol = _COIN_TO_SYMBOL
+        self.symbol_to_coin = _SYMBOL_TO_COIN
+        self.dex_contracts = _DEX_CONTRACTS
         
         # Sponsor integrations
         self.use_hyperion_oracle = use_hyperion  # Hyperion for better price data
         self.hyperion_api = "https://api.hyperion.xyz/v1"  # Placeholder URL
         
+        # Reusable simdjson parser (keeps its internal buffers between parses)
+        self._sjparser = simdjson.Parser() if SIMDJSON_AVAILABLE else None
+        
+        # Shared HTTP/2 client for indexer / price APIs - concurrent requests
+        # to one host are multiplexed over a single connection
+        self._http = httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+            timeout=10.0,
+        )
+        
         # Price cache
-        self._price_cache = {}
-        self._cache_expiry = {}
         self.cache_duration = 30  # 30 seconds
+        self._price_cache = TTLCache(maxsize=1024, ttl=self.cache_duration, timer=time.monotonic)
+        
+        # Last ETag and value per price key, for conditional GETs
+        self._etags: Dict[str, Tuple[str, float]] = {}
+        
+        # Vault deposits per vault owner: (monotonic timestamp, {address_lower: amount})
+        self._vault_cache: Dict[str, Tuple[float, Dict[str, int]]] = {}
+        self.vault_cache_duration = 5  # 5 seconds
+        
+        # In-flight fetches shared by concurrent callers (single-flight)
+        self._inflight: Dict[str, asyncio.Task] = {}
         
         logger.info(f"Initialized Aptos Info (Hyperion Oracle: {use_hyperion})")
     
+    @classmethod
+    def from_client(cls, client: RestClient, use_hyperion: bool = True) -> "AptosInfo":
+        """Create an AptosInfo that shares an existing RestClient"""
+        return cls(use_hyperion=use_hyperion, client=client)
+    
     async def get_account_balance(self, address: str, coin_type: str = None) -> int:
-        """Get account balance for specific coin"""
+        """
+        Get account balance for specific coin
+        The three lookup methods run concurrently, but results are taken in priority
+        order (direct resource, resource scan, indexer) so the answer is deterministic
+        """
         coin_type = coin_type or "0x1::aptos_coin::AptosCoin"
         
-        # Try method 1: Direct resource query
+        tasks = [
+            asyncio.create_task(self._balance_from_resource(address, coin_type)),
+            asyncio.create_task(self._balance_from_resources(address, coin_type)),
+            asyncio.create_task(self._balance_from_indexer(address, coin_type)),
+        ]
+        try:
+            for task in tasks:
+                balance = await task
+                if balance is not None:
+                    return balance
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+        
+        # Account has no balance
+        logger.debug("Account %s has no %s balance", address, coin_type)
+        return 0
+    
+    async def _balance_from_resource(self, address: str, coin_type: str) -> Optional[int]:
+        """Method 1: Direct CoinStore resource query"""
         try:
             resource_type = f"0x1::coin::CoinStore<{coin_type}>"
             resource = await self.client.account_resource(address, resource_type)
-            balance = int(resource["data"]["coin"]["value"])
-            return balance
+            return int(resource["data"]["coin"]["value"])
         except Exception as e:
-            logger.debug(f"CoinStore not found via account_resource: {e}")
-        
-        # Try method 2: Query all resources
+            logger.debug("CoinStore not found via account_resource: %s", e)
+            return None
+    
+    async def _balance_from_resources(self, address: str, coin_type: str) -> Optional[int]:
+        """Method 2: Scan all account resources"""
         try:
             resources = await self.client.account_resources(address)
+            store_type = f"0x1::coin::CoinStore<{coin_type}>"
             for resource in resources:
-                if "0x1::coin::CoinStore" in resource["type"] and coin_type.split("::")[-1] in resource["type"]:
+                if resource["type"] == store_type:
                     balance = int(resource["data"]["coin"]["value"])
-                    logger.info(f"Found balance via account_resources: {balance / 100000000:.8f} APT")
+                    if logger.isEnabledFor(logging.INFO):
+                        logger.info("Found balance via account_resources: %.8f APT", balance / 100000000)
                     return balance
         except Exception as e:
-            logger.debug(f"Error querying account_resources: {e}")
-        
-        # Try method 3: Use Indexer GraphQL API (what the explorer uses)
+            logger.debug("Error querying account_resources: %s", e)
+        return None
+    
+    async def _balance_from_indexer(self, address: str, coin_type: str) -> Optional[int]:
+        """Method 3: Indexer GraphQL API (what the explorer uses)"""
+        if self.indexer_url is None:
+            return None
         try:
-            indexer_url = "https://api.testnet.aptoslabs.com/v1/graphql"
-            query = """
-            query GetCoinBalances($owner_address: String!) {
-              current_fungible_asset_balances(
-                where: {owner_address: {_eq: $owner_address}}
-              ) {
-                amount
-                asset_type
-              }
-            }
-            """
-            
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    indexer_url,
-                    json={"query": query, "variables": {"owner_address": address}},
-                    headers={"Content-Type": "application/json"}
-                ) as resp:
-                    if resp.status == 200:
-                        data = await resp.json()
-                        balances = data.get("data", {}).get("current_fungible_asset_balances", [])
-                        for balance_entry in balances:
-                            if balance_entry.get("asset_type") == coin_type:
-                                balance = int(balance_entry["amount"])
-                                logger.info(f"Found balance via Indexer API: {balance / 100000000:.8f} APT")
-                                return balance
+            async with self._http.stream(
+                "POST",
+                self.indexer_url,
+                content=_owner_query_body(_BALANCE_QUERY_BODY, address),
+                headers={"Content-Type": "application/json"}
+            ) as resp:
+                if resp.status_code == 200:
+                    if IJSON_AVAILABLE:
+                        balance = await self._stream_indexer_balance(resp, coin_type)
+                    else:
+                        balance = self._find_indexer_balance(await resp.aread(), coin_type)
+                    if balance is not None:
+                        if logger.isEnabledFor(logging.INFO):
+                            logger.info("Found balance via Indexer API: %.8f APT", balance / 100000000)
+                        return balance
         except Exception as e:
-            logger.debug(f"Error querying Indexer API: {e}")
-        
-        # Account has no balance
-        logger.debug(f"Account {address} has no {coin_type} balance")
-        return 0
+            logger.debug("Error querying Indexer API: %s", e)
+        return None
     
-    async def get_all_balances(self, address: str) -> Dict[str, int]:
-        """Get all coin balances for an account"""
+    async def get_all_balances(self, address: str, known_only: bool = False) -> Dict[str, int]:
+        """
+        Get all coin balances for an account
+        With known_only=True only mapped symbols are returned and the scan
+        stops as soon as all of them have been seen
+        """
         try:
             resources = await self.get_account_resources(address)
             balances = {}
+            wanted = set(self.symbol_to_coin) if known_only else None
             
             for resource in resources:
-                if "CoinStore" in resource.get("type", ""):
-                    coin_type = resource["type"].split("<")[1].split(">")[0]
-                    balance = int(resource["data"]["coin"]["value"])
-                    symbol = self.coin_to_symbol.get(coin_type, coin_type)
-                    balances[symbol] = balance
+                resource_type = resource.get("type", "")
+                if not resource_type.startswith(_COINSTORE_PREFIX):
+                    continue
+                match = _COINSTORE_RE.match(resource_type)
+                if not match:
+                    continue
+                
+                coin_type = match.group(1)
+                symbol = self.coin_to_symbol.get(coin_type)
+                if symbol is None:
+                    if known_only:
+                        continue
+                    symbol = coin_type
+                
+                balances[symbol] = int(resource["data"]["coin"]["value"])
+                
+                if known_only:
+                    wanted.discard(symbol)
+                    if not wanted:
+                        break
             
             return balances
         except Exception as e:
@@ -133,48 +367,92 @@ class AptosInfo(AptosAPI):
         """Get APT price in USD from CoinGecko"""
         try:
             cache_key = "apt_usd"
-            if self._is_cached(cache_key):
-                return self._price_cache[cache_key]
-            
-            async with aiohttp.ClientSession() as session:
-                url = "https://api.coingecko.com/api/v3/simple/price?ids=aptos&vs_currencies=usd"
-                async with session.get(url) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        price = float(data["aptos"]["usd"])
-                        self._cache_price(cache_key, price)
-                        return price
+            cached_price = self._price_cache.get(cache_key)
+            if cached_price is not None:
+                return cached_price
             
-            return 0.0
+            return await self._single_flight(cache_key, self._fetch_apt_price_usd)
         except Exception as e:
             logger.error(f"Error getting APT price: {e}")
             return 0.0
     
+    async def _fetch_apt_price_usd(self) -> float:
+        """Fetch APT price from CoinGecko and cache it"""
+        cache_key = "apt_usd"
+        url = "https://api.coingecko.com/api/v3/simple/price?ids=aptos&vs_currencies=usd"
+        
+        # Conditional GET: an unchanged price comes back as a bodiless 304
+        validator = self._etags.get(cache_key)
+        headers = {"If-None-Match": validator[0]} if validator else None
+        
+        response = await self._http.get(url, headers=headers)
+        if response.status_code == 304 and validator:
+            price = validator[1]
+            self._cache_price(cache_key, price)
+            return price
+        if response.status_code == 200:
+            data = self._json(response)
+            price = float(data["aptos"]["usd"])
+            self._cache_price(cache_key, price)
+            etag = response.headers.get("ETag")
+            if etag:
+                self._etags[cache_key] = (etag, price)
+            return price
+        
+        return 0.0
+    
     async def get_pair_price(self, coin_a: str, coin_b: str, dex: str = None) -> float:
         """Get current price for a trading pair"""
         try:
             cache_key = f"{coin_a}_{coin_b}_{dex or 'default'}"
-            if self._is_cached(cache_key):
-                return self._price_cache[cache_key]
+            cached_price = self._price_cache.get(cache_key)
+            if cached_price is not None:
+                return cached_price
             
-            # For APT/USD pairs, use CoinGecko
-            if coin_a == "0x1::aptos_coin::AptosCoin" and "USD" in coin_b:
-                price = await self.get_apt_price_usd()
-                self._cache_price(cache_key, price)
-                return price
-            
-            # For other pairs, query DEX reserves
-            reserves_a, reserves_b = await self.get_pair_reserves(coin_a, coin_b, dex)
-            if reserves_a > 0 and reserves_b > 0:
-                price = reserves_b / reserves_a
-                self._cache_price(cache_key, price)
-                return price
-            
-            return 0.0
+            return await self._single_flight(
+                cache_key,
+                lambda: self._fetch_pair_price(coin_a, coin_b, dex, cache_key)
+            )
         except Exception as e:
             logger.error(f"Error getting pair price {coin_a}/{coin_b}: {e}")
             return 0.0
     
+    async def _fetch_pair_price(self, coin_a: str, coin_b: str, dex: Optional[str], cache_key: str) -> float:
+        """Compute a pair price and cache it"""
+        # For APT/USD pairs, use CoinGecko
+        if coin_a == "0x1::aptos_coin::AptosCoin" and "USD" in coin_b:
+            price = await self.get_apt_price_usd()
+            self._cache_price(cache_key, price)
+            return price
+        
+        # For other pairs, query DEX reserves
+        reserves_a, reserves_b = await self.get_pair_reserves(coin_a, coin_b, dex)
+        if reserves_a > 0 and reserves_b > 0:
+            price = reserves_b / reserves_a
+            self._cache_price(cache_key, price)
+            return price
+        
+        return 0.0
+    
+    async def _single_flight(self, key: str, coro_factory):
+        """
+        Run coro_factory() once per key; concurrent callers await the same result
+        The fetch runs in its own task, so a cancelled caller never cancels it for the others
+        """
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(coro_factory())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._finish_flight(key, t))
+        return await asyncio.shield(task)
+    
+    def _finish_flight(self, key: str, task: asyncio.Task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Mark the error retrieved even if every waiter was cancelled
+        if not task.cancelled():
+            task.exception()
+    
     async def get_pair_reserves(self, coin_a: str, coin_b: str, dex: str = None) -> Tuple[int, int]:
         """Get liquidity pool reserves for a trading pair"""
         try:
@@ -194,52 +472,83 @@ class AptosInfo(AptosAPI):
             logger.error(f"Error getting pair reserves {coin_a}/{coin_b}: {e}")
             return (0, 0)
     
-    async def get_pool_info(self, coin_a: str, coin_b: str, dex: str = None) -> Dict:
+    async def get_pool_info(self, coin_a: str, coin_b: str, dex: str = None) -> Optional[PoolInfo]:
         """Get detailed pool information"""
         try:
-            reserves_a, reserves_b = await self.get_pair_reserves(coin_a, coin_b, dex)
-            price = await self.get_pair_price(coin_a, coin_b, dex)
+            (reserves_a, reserves_b), price = await asyncio.gather(
+                self.get_pair_reserves(coin_a, coin_b, dex),
+                self.get_pair_price(coin_a, coin_b, dex)
+            )
             
-            return {
-                "coin_a": coin_a,
-                "coin_b": coin_b,
-                "reserves_a": reserves_a,
-                "reserves_b": reserves_b,
-                "price": price,
-                "dex": dex or "pancakeswap",
-                "total_liquidity": reserves_a + reserves_b,
-                "timestamp": int(time.time())
-            }
+            return PoolInfo(
+                coin_a=coin_a,
+                coin_b=coin_b,
+                reserves_a=reserves_a,
+                reserves_b=reserves_b,
+                price=price,
+                dex=dex or "pancakeswap",
+                total_liquidity=reserves_a + reserves_b,
+                timestamp=int(time.time())
+            )
         except Exception as e:
             logger.error(f"Error getting pool info: {e}")
-            return {}
+            return None
     
     async def get_all_pools(self, dex: str = None) -> List[Dict]:
         """Get information for all available pools"""
         try:
-            # Common trading pairs on Aptos
-            pairs = [
-                ("0x1::aptos_coin::AptosCoin", "0xf22bede237a07e121b56d91a491eb7bcdfd1f5907926a9e58338f964a01b17fa::asset::USDC"),
-                ("0x1::aptos_coin::AptosCoin", "0xf22bede237a07e121b56d91a491eb7bcdfd1f5907926a9e58338f964a01b17fa::asset::USDT"),
-                ("0xf22bede237a07e121b56d91a491eb7bcdfd1f5907926a9e58338f964a01b17fa::asset::USDC", "0xf22bede237a07e121b56d91a491eb7bcdfd1f5907926a9e58338f964a01b17fa::asset::USDT"),
-            ]
+            pools = await asyncio.gather(
+                *(self.get_pool_info(coin_a, coin_b, dex) for coin_a, coin_b in _KNOWN_PAIRS)
+            )
             
-            pools = []
-            for coin_a, coin_b in pairs:
-                pool_info = await self.get_pool_info(coin_a, coin_b, dex)
-                if pool_info:
-                    pools.append(pool_info)
-            
-            return pools
+            # Plain dicts at the API boundary
+            return [pool_info.to_dict() for pool_info in pools if pool_info]
         except Exception as e:
             logger.error(f"Error getting all pools: {e}")
             return []
     
+    async def _get_indexer_balances(self, address: str) -> Optional[Dict[str, int]]:
+        """
+        Get balances of known coins keyed by symbol from the indexer, or None if it is unavailable
+        Same key set as get_all_balances(known_only=True)
+        """
+        if self.indexer_url is None:
+            return None
+        try:
+            resp = await self._http.post(
+                self.indexer_url,
+                content=_owner_query_body(_PORTFOLIO_QUERY_BODY, address),
+                headers={"Content-Type": "application/json"}
+            )
+            if resp.status_code != 200:
+                return None
+            data = self._json(resp)
+            
+            entries = (data.get("data") or {}).get("balances")
+            if entries is None:
+                return None
+            balances = {}
+            for entry in entries:
+                symbol = self.coin_to_symbol.get(entry["asset_type"])
+                if symbol is not None:
+                    balances[symbol] = int(entry["amount"])
+            return balances
+        except Exception as e:
+            logger.debug("Error querying indexer balances for %s: %s", address, e)
+            return None
+    
     async def get_account_portfolio(self, address: str) -> Dict:
         """Get complete portfolio information for an account"""
         try:
-            balances = await self.get_all_balances(address)
-            apt_price = await self.get_apt_price_usd()
+            # Balances come from one indexer query; the CoinGecko price can't be
+            # folded into GraphQL so it is fetched alongside
+            balances, apt_price = await asyncio.gather(
+                self._get_indexer_balances(address),
+                self.get_apt_price_usd()
+            )
+            # An empty result may just mean the indexer lags the node - check on-chain
+            if not balances:
+                balances = await self.get_all_balances(address, known_only=True)
             
             portfolio = {
                 "address": address,
@@ -249,28 +558,28 @@ class AptosInfo(AptosAPI):
                 "timestamp": int(time.time())
             }
             
-            # Calculate total portfolio value
+            # Calculate total portfolio value in integer micro-USD; convert to
+            # float only for the returned fields
+            apt_price_micro = int(apt_price * MICRO_USD)
+            total_micro = 0
+            positions = []
             for symbol, balance in balances.items():
-                if symbol == "APT":
-                    value_usd = (balance / 100000000) * apt_price  # Convert octas to APT
-                    portfolio["total_value_usd"] += value_usd
-                    portfolio["positions"].append({
-                        "symbol": symbol,
-                        "balance": balance,
-                        "balance_formatted": balance / 100000000,
-                        "price_usd": apt_price,
-                        "value_usd": value_usd
-                    })
-                elif symbol in ["USDC", "USDT"]:
-                    value_usd = balance / 1000000  # Assuming 6 decimals for stablecoins
-                    portfolio["total_value_usd"] += value_usd
-                    portfolio["positions"].append({
-                        "symbol": symbol,
-                        "balance": balance,
-                        "balance_formatted": balance / 1000000,
-                        "price_usd": 1.0,
-                        "value_usd": value_usd
-                    })
+                scale = _UNIT_SCALE.get(symbol)
+                if scale is None:
+                    continue
+                price_micro = apt_price_micro if symbol == "APT" else MICRO_USD
+                value_micro = balance * price_micro // scale
+                total_micro += value_micro
+                positions.append({
+                    "symbol": symbol,
+                    "balance": balance,
+                    "balance_formatted": balance / scale,
+                    "price_usd": price_micro / MICRO_USD,
+                    "value_usd": value_micro / MICRO_USD
+                })
+            
+            portfolio["total_value_usd"] = total_micro / MICRO_USD
+            portfolio["positions"] = positions
             
             return portfolio
         except Exception as e:
@@ -280,45 +589,57 @@ class AptosInfo(AptosAPI):
     async def get_user_vault_deposit(self, vault_owner: str, user_address: str) -> int:
         """Get user's deposit amount in the trading vault"""
         try:
-            # Query the TradingVault resource to get user deposits
-            resource_type = f"{vault_owner}::trading_vault::TradingVault"
-            resource = await self.client.account_resource(vault_owner, resource_type)
-            
-            # Find user in the vault's user_addresses list
-            user_addresses = resource["data"].get("user_addresses", [])
-            user_deposits = resource["data"].get("user_deposits", [])
-            
-            for i, addr in enumerate(user_addresses):
-                if addr.lower() == user_address.lower():
-                    return int(user_deposits[i].get("amount", 0))
+            cached = self._vault_cache.get(vault_owner)
+            if cached is not None and time.monotonic() - cached[0] < self.vault_cache_duration:
+                deposits = cached[1]
+            else:
+                deposits = await self._load_vault_deposits(vault_owner)
             
-            return 0  # User has no deposit
+            return deposits.get(user_address.lower(), 0)  # 0 if user has no deposit
         except Exception as e:
-            logger.debug(f"No vault deposit found for {user_address} in vault {vault_owner}: {e}")
+            logger.debug("No vault deposit found for %s in vault %s: %s", user_address, vault_owner, e)
             return 0
     
-    async def get_transaction_details(self, txn_hash: str) -> Dict:
-        """Get detailed transaction information"""
+    async def _load_vault_deposits(self, vault_owner: str) -> Dict[str, int]:
+        """Fetch the TradingVault resource and index deposits by lower-cased address"""
+        resource_type = f"{vault_owner}::trading_vault::TradingVault"
+        resource = await self.client.account_resource(vault_owner, resource_type)
+        
+        user_addresses = resource["data"].get("user_addresses", [])
+        user_deposits = resource["data"].get("user_deposits", [])
+        
+        deposits = {
+            addr.lower(): int(deposit.get("amount", 0))
+            for addr, deposit in zip(user_addresses, user_deposits)
+        }
+        self._vault_cache[vault_owner] = (time.monotonic(), deposits)
+        return deposits
+    
+    async def get_transaction_details(self, txn_hash: str) -> Optional[TxnDetails]:
+        """
+        Get detailed transaction information
+        Encode with msgspec.json.encode() to serialize without an intermediate dict
+        """
         try:
             txn = await self.get_transaction_by_hash(txn_hash)
             if not txn:
-                return {}
+                return None
             
-            return {
-                "hash": txn_hash,
-                "sender": txn.get("sender"),
-                "sequence_number": txn.get("sequence_number"),
-                "gas_used": txn.get("gas_used"),
-                "gas_unit_price": txn.get("gas_unit_price"),
-                "success": txn.get("success"),
-                "timestamp": txn.get("timestamp"),
-                "type": txn.get("type"),
-                "payload": txn.get("payload"),
-                "events": txn.get("events", [])
-            }
+            return TxnDetails(
+                hash=txn_hash,
+                sender=txn.get("sender"),
+                sequence_number=txn.get("sequence_number"),
+                gas_used=txn.get("gas_used"),
+                gas_unit_price=txn.get("gas_unit_price"),
+                success=txn.get("success"),
+                timestamp=txn.get("timestamp"),
+                type=txn.get("type"),
+                payload=txn.get("payload"),
+                events=txn.get("events", [])
+            )
         except Exception as e:
             logger.error(f"Error getting transaction details for {txn_hash}: {e}")
-            return {}
+            return None
     
     async def get_staking_info(self, address: str) -> Dict:
         """Get staking information for an account"""
@@ -334,48 +655,82 @@ class AptosInfo(AptosAPI):
                 "timestamp": int(time.time())
             }
             
-            # Parse staking resources
+            # Parse staking resources in one pass (type strings are canonical lower-case module paths)
+            active_stake = 0
+            pending_inactive = 0
             for resource in resources:
-                resource_type = resource.get("type", "")
-                if "stake" in resource_type.lower():
-                    # Extract staking information
-                    data = resource.get("data", {})
-                    if "active" in data:
-                        staking_info["active_stake"] += int(data.get("active", {}).get("value", 0))
-                    if "pending_inactive" in data:
-                        staking_info["pending_inactive"] += int(data.get("pending_inactive", {}).get("value", 0))
+                if _STAKE_MARKER not in resource.get("type", ""):
+                    continue
+                data = resource.get("data", {})
+                active = data.get("active")
+                if active:
+                    active_stake += int(active.get("value", 0))
+                pending = data.get("pending_inactive")
+                if pending:
+                    pending_inactive += int(pending.get("value", 0))
             
-            staking_info["total_staked"] = staking_info["active_stake"] + staking_info["pending_inactive"]
+            staking_info["active_stake"] = active_stake
+            staking_info["pending_inactive"] = pending_inactive
+            staking_info["total_staked"] = active_stake + pending_inactive
             
             return staking_info
         except Exception as e:
             logger.error(f"Error getting staking info for {address}: {e}")
             return {}
     
+    @staticmethod
+    async def _stream_indexer_balance(response: httpx.Response, coin_type: str) -> Optional[int]:
+        """Parse indexer balance entries as they arrive and stop at the first match"""
+        entries = ijson.sendable_list()
+        parser = ijson.items_coro(entries, "data.current_fungible_asset_balances.item")
+        async for chunk in response.aiter_bytes():
+            parser.send(chunk)
+            for entry in entries:
+                if entry.get("asset_type") == coin_type:
+                    return int(entry["amount"])
+            del entries[:]
+        return None
+    
+    def _find_indexer_balance(self, raw: bytes, coin_type: str) -> Optional[int]:
+        """
+        Extract one coin's amount from an indexer balances response
+        With simdjson only the visited fields are materialized
+        """
+        if self._sjparser is not None:
+            # Parsed document must not outlive this call - the parser is reused
+            doc = self._sjparser.parse(raw)
+            entries = doc.get("data", {}).get("current_fungible_asset_balances", [])
+        else:
+            entries = _fast_json.loads(raw).get("data", {}).get("current_fungible_asset_balances", [])
+        
+        for entry in entries:
+            if entry.get("asset_type") == coin_type:
+                return int(entry["amount"])
+        return None
+    
+    @staticmethod
+    def _json(response: httpx.Response) -> Any:
+        """Decode a response body with the fast JSON parser"""
+        return _fast_json.loads(response.content)
+    
     def _is_cached(self, key: str) -> bool:
         """Check if price is cached and not expired"""
-        if key not in self._price_cache:
-            return False
-        
-        if key not in self._cache_expiry:
-            return False
-        
-        return time.time() < self._cache_expiry[key]
+        return key in self._price_cache
     
     def _cache_price(self, key: str, price: float):
         """Cache price with expiry"""
         self._price_cache[key] = price
-        self._cache_expiry[key] = time.time() + self.cache_duration
     
     def get_coin_symbol(self, coin_type: str) -> str:
         """Get symbol for coin type"""
-        return self.coin_to_symbol.get(coin_type, coin_type)
+        return _coin_to_symbol_impl(coin_type)
     
     def get_coin_type(self, symbol: str) -> str:
         """Get coin type for symbol"""
-        return self.symbol_to_coin.get(symbol, symbol)
+        return _symbol_to_coin_impl(symbol)
     
     async def close(self):
         """Clean up resources"""
+        await self._http.aclose()
         await super().close()
         logger.info("Aptos Info closed")
@@ -2,24 +2,45 @@
 Production-grade Aptos authentication module with wallet support
 Equivalent to Hyperliquid auth but for Aptos blockchain
 """
-import json
+import asyncio
 import os
 import logging
+import random
 import time
 from typing import Tuple, Dict, Optional, Any
 
-from aptos_sdk.account import Account
+import aiohttp
 from aptos_sdk.async_client import RestClient
 
 from aptos.exchange import AptosExchange
 from aptos.info import AptosInfo
+from aptos_utils import (
+    generate_account,
+    get_account_address,
+    load_account,
+    load_json_async,
+    network_urls,
+    write_json_async,
+)
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Transient failures worth retrying vs. errors a retry cannot fix
+_RECOVERABLE_ERRORS = (aiohttp.ClientError, asyncio.TimeoutError, ConnectionError)
+_UNRECOVERABLE_ERRORS = (ValueError, PermissionError)
+# Errors the connect methods pass up so the retry loop can classify them
+_CLASSIFIED_ERRORS = _RECOVERABLE_ERRORS + _UNRECOVERABLE_ERRORS
+
 class AptosAuth:
     """Secure Aptos authentication with wallet support"""
     
+    # Upper bound on the delay between connection attempts (seconds)
+    MAX_BACKOFF = 30.0
+    
+    # How long a successful ledger ping is trusted (seconds)
+    LEDGER_PING_TTL = 30.0
+    
     def __init__(
         self, 
         config_dir: str = ".",
@@ -28,124 +49,193 @@ class AptosAuth:
         network: str = "testnet",
         auto_reconnect: bool = True,
         reconnect_interval: int = 300,  # 5 minutes
-        max_retries: int = 3
+        max_retries: int = 3,
+        base_delay: float = 1.0
     ):
         self.config_dir = os.path.abspath(config_dir)
         self.config_path = os.path.join(self.config_dir, config_file)
         self.wallet_config_path = os.path.join(self.config_dir, wallet_config_file)
+        # Config directory listing (path -> DirEntry), scanned on first connect and on forced refresh
+        self._dir_entries: Optional[Dict[str, os.DirEntry]] = None
         
         # Network settings
         self.network = network
-        if network == "mainnet":
-            self.node_url = "https://fullnode.mainnet.aptoslabs.com/v1"
-            self.faucet_url = None
-        else:
-            self.node_url = "https://fullnode.testnet.aptoslabs.com/v1"
-            self.faucet_url = "https://faucet.testnet.aptoslabs.com"
+        self.node_url, self.faucet_url = network_urls(network)
         
         # Connection state
         self.account = None
         self.address = None
-        self.info = None
-        self.exchange = None
+        # Info and exchange clients are built on first access (see the properties below)
+        self._info: Optional[AptosInfo] = None
+        self._exchange: Optional[AptosExchange] = None
         self.connected = False
-        self.last_connected = 0
+        # Set only once an account has been loaded and checked
+        self._is_connected_flag = False
+        self.last_connected = 0  # wall-clock, for reporting
+        self._last_connected_mono = float("-inf")  # monotonic, for the reuse check
         self.connection_attempts = 0
         
+        # Shared node client and HTTP session, reused across reconnects
+        self._client: Optional[RestClient] = None
+        self._session: Optional[aiohttp.ClientSession] = None
+        
+        # Connection checks already done: last ledger ping (monotonic) and verified addresses
+        self._last_ping_ts = float("-inf")
+        self._verified_addresses = set()
+        
         # Reconnection settings
         self.auto_reconnect = auto_reconnect
         self.reconnect_interval = reconnect_interval
         self.max_retries = max_retries
+        self.base_delay = base_delay
         
-        logger.info(f"Initialized Aptos Auth for {network} network")
+        logger.info("Initialized Aptos Auth for %s network", network)
+    
+    @property
+    def info(self) -> Optional[AptosInfo]:
+        """
+        Market data client, created on first access
+        Not tied to an account, so it stays valid across reconnects until close()
+        """
+        if self._info is None and self.account is not None:
+            self._info = AptosInfo.from_client(self._get_client())
+        return self._info
     
-    async def connect(self, force_refresh: bool = False) -> Tuple[str, AptosInfo, AptosExchange]:
+    @property
+    def exchange(self) -> Optional[AptosExchange]:
+        """
+        Trading client for the connected account, created on first access
+        Stays valid across reconnects to the same account. A reconnect that loads a
+        different account closes it, so callers must read this property again
+        """
+        if self._exchange is None and self.account is not None:
+            # Keep a single AptosInfo per connection; we close it, not the exchange
+            self._exchange = AptosExchange(
+                self.account,
+                self.node_url,
+                client=self._get_client(),
+                session=self._session,
+                info=self.info
+            )
+        return self._exchange
+    
+    async def connect(self, force_refresh: bool = False) -> str:
         """
         Connect to Aptos network with wallet authentication
+        Transient failures are retried up to max_retries times with jittered exponential backoff.
+        No info or exchange client is built here - read .info / .exchange when needed
         
         Args:
             force_refresh: Force a new connection even if recently connected
             
         Returns:
-            Tuple of (address, info, exchange)
+            Connected account address
             
         Raises:
             ValueError: If authentication fails
             ConnectionError: If API connection fails
         """
+        await self._connect(force_refresh)
+        return self.address
+    
+    async def _connect(self, force_refresh: bool = False):
+        """Load and check the account; info and exchange are left to be built on demand"""
         # Check if already connected and not forced refresh
-        current_time = time.time()
         if (
-            self.connected and 
-            self.address and self.info and self.exchange and
+            self._is_connected_flag and
             not force_refresh and 
-            (current_time - self.last_connected) < self.reconnect_interval
+            (time.monotonic() - self._last_connected_mono) < self.reconnect_interval
         ):
-            logger.debug(f"Using existing connection for {self.address} on {self.network}")
-            return self.address, self.info, self.exchange
+            logger.debug("Using existing connection for %s on %s", self.address, self.network)
+            return
         
         # Reset connection state
         self.connected = False
-        if not (self.address and self.info and self.exchange and force_refresh):
-            self.connection_attempts += 1
+        self._is_connected_flag = False
+        last_error = None
         
-        if self.connection_attempts > self.max_retries:
-            self.connection_attempts = 0
-            logger.error(f"Failed to connect to {self.network} after {self.max_retries} attempts")
-            raise ConnectionError(f"Failed to connect to {self.network} after {self.max_retries} attempts")
+        if force_refresh or self._dir_entries is None:
+            self._scan_config_dir()
         
-        try:
-            logger.info(f"Attempting to connect to {self.network}. Attempt {self.connection_attempts}/{self.max_retries}")
-            
-            # Try wallet authentication
-            if os.path.exists(self.wallet_config_path):
-                logger.info(f"Wallet config found at {self.wallet_config_path}. Attempting wallet connection")
-                result = await self._connect_with_wallet()
-                if result:
-                    self.address, self.info, self.exchange = result
-                    self.connected = True
-                    self.last_connected = current_time
-                    self.connection_attempts = 0
-                    logger.info(f"Successfully connected with wallet {self.address} on {self.network}")
-                    return self.address, self.info, self.exchange
-            
-            # Try main config authentication
-            if os.path.exists(self.config_path):
-                logger.info(f"Main config found at {self.config_path}. Attempting main connection")
-                result = await self._connect_with_main_config()
+        # Created here, inside the running loop, so the exchange can share it
+        await self._get_session()
+        
+        for attempt in range(1, self.max_retries + 1):
+            self.connection_attempts = attempt
+            try:
+                logger.info("Attempting to connect to %s. Attempt %d/%d", self.network, attempt, self.max_retries)
+                
+                # Try wallet authentication
+                if self.wallet_config_path in self._dir_entries:
+                    logger.info("Wallet config found at %s. Attempting wallet connection", self.wallet_config_path)
+                    result = await self._connect_with_wallet(force_refresh)
+                    if result:
+                        self._mark_connected()
+                        logger.info("Successfully connected with wallet %s on %s", self.address, self.network)
+                        return
+                
+                # Try main config authentication
+                if self.config_path in self._dir_entries:
+                    logger.info("Main config found at %s. Attempting main connection", self.config_path)
+                    result = await self._connect_with_main_config(force_refresh)
+                    if result:
+                        self._mark_connected()
+                        logger.info("Successfully connected with main config %s on %s", self.address, self.network)
+                        return
+                
+                # Generate new wallet if no config exists
+                logger.info("No configuration found. Generating new wallet")
+                result = await self._generate_new_wallet()
                 if result:
-                    self.address, self.info, self.exchange = result
-                    self.connected = True
-                    self.last_connected = current_time
-                    self.connection_attempts = 0
-                    logger.info(f"Successfully connected with main config {self.address} on {self.network}")
-                    return self.address, self.info, self.exchange
-            
-            # Generate new wallet if no config exists
-            logger.info("No configuration found. Generating new wallet")
-            result = await self._generate_new_wallet()
-            if result:
-                self.address, self.info, self.exchange = result
-                self.connected = True
-                self.last_connected = current_time
-                self.connection_attempts = 0
-                logger.info(f"Successfully connected with new wallet {self.address} on {self.network}")
-                return self.address, self.info, self.exchange
-            
-            raise ConnectionError("Failed to establish any connection method")
-            
-        except Exception as e:
-            logger.error(f"Connection attempt {self.connection_attempts} failed: {e}")
-            if self.connection_attempts >= self.max_retries:
+                    self._mark_connected()
+                    logger.info("Successfully connected with new wallet %s on %s", self.address, self.network)
+                    return
+                
+                raise ConnectionError("Failed to establish any connection method")
+                
+            except _UNRECOVERABLE_ERRORS as e:
+                # Bad keys or config will not fix themselves - fail fast
+                logger.error("Connection attempt %d failed permanently: %s", attempt, e)
                 self.connection_attempts = 0
-                raise ConnectionError(f"Failed to connect after {self.max_retries} attempts: {e}")
-            raise
+                raise
+            except _RECOVERABLE_ERRORS as e:
+                logger.error("Connection attempt %d failed: %s", attempt, e)
+                last_error = e
+                if attempt < self.max_retries:
+                    await asyncio.sleep(self._backoff_delay(attempt - 1))
+        
+        self.connection_attempts = 0
+        raise ConnectionError(f"Failed to connect after {self.max_retries} attempts: {last_error}")
+    
+    def _mark_connected(self):
+        """Record a successful connection"""
+        self.connected = True
+        self._is_connected_flag = True
+        self._last_connected_mono = time.monotonic()
+        self.last_connected = time.time()
+        self.connection_attempts = 0
     
-    async def _connect_with_wallet(self) -> Optional[Tuple[str, AptosInfo, AptosExchange]]:
+    def _scan_config_dir(self):
+        """List the config directories once so retries don't repeat existence checks"""
+        entries = {}
+        for directory in {os.path.dirname(self.config_path), os.path.dirname(self.wallet_config_path)}:
+            try:
+                with os.scandir(directory) as it:
+                    for entry in it:
+                        if entry.is_file():
+                            entries[entry.path] = entry
+            except FileNotFoundError:
+                pass
+        self._dir_entries = entries
+    
+    def _backoff_delay(self, attempt: int) -> float:
+        """Exponential backoff with up to 50% jitter, capped at MAX_BACKOFF seconds"""
+        return min(self.MAX_BACKOFF, self.base_delay * (2 ** attempt) * (1 + random.random() * 0.5))
+    
+    async def _connect_with_wallet(self, force_refresh: bool = False) -> Optional[str]:
         """Connect using wallet configuration"""
         try:
-            with open(self.wallet_config_path, 'r') as f:
-                wallet_config = json.load(f)
+            wallet_config = await load_json_async(self.wallet_config_path)
             
             private_key = wallet_config.get('private_key')
             if not private_key:
@@ -153,28 +243,28 @@ class AptosAuth:
                 return None
             
             # Create account from private key
-            self.account = Account.load_key(private_key)
-            self.address = str(self.account.address())
+            self.account = load_account(private_key)
+            self.address = get_account_address(self.account)
             
-            # Initialize info and exchange
-            self.info = AptosInfo(self.node_url)
-            self.exchange = AptosExchange(self.account, self.node_url)
+            # Clients for any previous account are rebuilt on next access
+            await self._reset_clients()
             
             # Test connection
-            await self._test_connection()
+            await self._test_connection(force_refresh)
             
-            logger.info(f"Wallet connection successful for {self.address}")
-            return self.address, self.info, self.exchange
+            logger.info("Wallet connection successful for %s", self.address)
+            return self.address
             
         except Exception as e:
-            logger.error(f"Wallet connection failed: {e}")
+            logger.error("Wallet connection failed: %s", e)
+            if isinstance(e, _CLASSIFIED_ERRORS):
+                raise
             return None
     
-    async def _connect_with_main_config(self) -> Optional[Tuple[str, AptosInfo, AptosExchange]]:
+    async def _connect_with_main_config(self, force_refresh: bool = False) -> Optional[str]:
         """Connect using main configuration"""
         try:
-            with open(self.config_path, 'r') as f:
-                config = json.load(f)
+            config = await load_json_async(self.config_path)
             
             aptos_config = config.get('aptos', {})
             private_key = aptos_config.get('admin_private_key')
@@ -184,81 +274,139 @@ class AptosAuth:
                 return None
             
             # Create account from private key
-            self.account = Account.load_key(private_key)
-            self.address = str(self.account.address())
+            self.account = load_account(private_key)
+            self.address = get_account_address(self.account)
             
-            # Initialize info and exchange
-            self.info = AptosInfo(self.node_url)
-            self.exchange = AptosExchange(self.account, self.node_url)
+            # Clients for any previous account are rebuilt on next access
+            await self._reset_clients()
             
             # Test connection
-            await self._test_connection()
+            await self._test_connection(force_refresh)
             
-            logger.info(f"Main config connection successful for {self.address}")
-            return self.address, self.info, self.exchange
+            logger.info("Main config connection successful for %s", self.address)
+            return self.address
             
         except Exception as e:
-            logger.error(f"Main config connection failed: {e}")
+            logger.error("Main config connection failed: %s", e)
+            if isinstance(e, _CLASSIFIED_ERRORS):
+                raise
             return None
     
-    async def _generate_new_wallet(self) -> Optional[Tuple[str, AptosInfo, AptosExchange]]:
+    async def _generate_new_wallet(self) -> Optional[str]:
         """Generate new wallet and save configuration"""
         try:
             # Generate new account
-            self.account = Account.generate()
-            self.address = str(self.account.address())
+            self.account, private_key_hex, public_key_hex = generate_account()
+            self.address = get_account_address(self.account)
             
             # Save wallet configuration
             wallet_config = {
                 'address': self.address,
-                'private_key': self.account.private_key.hex(),
-                'public_key': self.account.public_key.hex(),
+                'private_key': f"0x{private_key_hex}",
+                'public_key': f"0x{public_key_hex}",
                 'network': self.network,
                 'created_at': int(time.time())
             }
             
-            with open(self.wallet_config_path, 'w') as f:
-                json.dump(wallet_config, f, indent=2)
+            await write_json_async(self.wallet_config_path, wallet_config)
+            # Later retries must find this wallet rather than generate another one
+            self._scan_config_dir()
             
-            logger.info(f"New wallet configuration saved to {self.wallet_config_path}")
+            logger.info("New wallet configuration saved to %s", self.wallet_config_path)
             
-            # Initialize info and exchange
-            self.info = AptosInfo(self.node_url)
-            self.exchange = AptosExchange(self.account, self.node_url)
+            # Clients for any previous account are rebuilt on next access
+            await self._reset_clients()
             
             # Test connection
             await self._test_connection()
             
-            # Fund account from faucet if on testnet
-            if self.network == "testnet" and self.faucet_url:
+            # Fund account from faucet on networks that have one
+            if self.faucet_url:
                 await self._fund_from_faucet()
             
-            logger.info(f"New wallet generated and connected: {self.address}")
-            return self.address, self.info, self.exchange
+            logger.info("New wallet generated and connected: %s", self.address)
+            return self.address
             
         except Exception as e:
-            logger.error(f"New wallet generation failed: {e}")
+            logger.error("New wallet generation failed: %s", e)
+            if isinstance(e, _CLASSIFIED_ERRORS):
+                raise
             return None
     
-    async def _test_connection(self):
-        """Test the connection by getting account info"""
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Get or create the pooled HTTP session (no await before creation, so no race)"""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=64, ttl_dns_cache=300, keepalive_timeout=75)
+            self._session = aiohttp.ClientSession(connector=connector)
+        return self._session
+    
+    def _get_client(self) -> RestClient:
+        """Get or create the shared node client"""
+        if self._client is None:
+            self._client = RestClient(self.node_url)
+        return self._client
+    
+    async def _reset_clients(self):
+        """Close the exchange if it was built for a different account than the one now loaded"""
+        exchange = self._exchange
+        if exchange is None or get_account_address(exchange.account) == self.address:
+            return
+        self._exchange = None
+        await exchange.close()
+    
+    async def _close_clients(self):
+        """Close and drop info and exchange"""
+        exchange, info = self._exchange, self._info
+        self._info = None
+        self._exchange = None
+        # The exchange leaves the shared info client to us
+        if exchange is not None:
+            await exchange.close()
+        if info is not None:
+            await info.close()
+    
+    async def _test_connection(self, force_refresh: bool = False):
+        """
+        Test the connection with a ledger ping
+        The account itself is only verified the first time an address connects or on a forced refresh
+        """
         try:
-            if not self.info:
-                raise ValueError("Info client not initialized")
+            await self._ping_ledger(force_refresh)
             
-            # Test connection by getting ledger info
-            ledger_info = await self.info.get_ledger_info()
-            if not ledger_info:
-                raise ConnectionError("Failed to get ledger information")
-            
-            # Get account balance to verify account exists
-            balance = await self.info.get_account_balance(self.address)
-            logger.info(f"Account balance: {balance / 100000000:.8f} APT")
+            if force_refresh or self.address not in self._verified_addresses:
+                await self._verify_account()
             
         except Exception as e:
-            logger.error(f"Connection test failed: {e}")
+            logger.error("Connection test failed: %s", e)
             raise
     
+    async def _ping_ledger(self, force: bool = False):
+        """Check the node responds, skipping the call if it answered recently"""
+        now = time.monotonic()
+        if not force and now - self._last_ping_ts < self.LEDGER_PING_TTL:
+            return
+        
+        # Straight on the node client, so connecting never builds the info client
+        try:
+            ledger_info = await self._get_client().info()
+        except Exception as e:
+            raise ConnectionError(f"Failed to get ledger information: {e}") from e
+        if not ledger_info:
+            raise ConnectionError("Failed to get ledger information")
+        self._last_ping_ts = now
+    
+    async def _verify_account(self):
+        """Get account balance to verify account exists"""
+        try:
+            balance = await self._get_client().account_balance(self.address)
+        except Exception as e:
+            # New, unfunded accounts have no on-chain state yet
+            logger.info("No balance found for %s: %s", self.address, e)
+        else:
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Account balance: %.8f APT", balance / 100000000)
+        self._verified_addresses.add(self.address)
+    
     async def _fund_from_faucet(self, amount: int = 100000000):  # 1 APT
         """Fund account from testnet faucet"""
         try:
@@ -266,38 +414,44 @@ class AptosAuth:
                 logger.warning("No faucet URL available")
                 return
             
-            import aiohttp
+            session = await self._get_session()
+            faucet_request = {
+                "address": self.address,
+                "amount": amount
+            }
             
-            async with aiohttp.ClientSession() as session:
-                faucet_request = {
-                    "address": self.address,
-                    "amount": amount
-                }
-                
-                async with session.post(self.faucet_url, json=faucet_request) as response:
-                    if response.status == 200:
-                        result = await response.json()
-                        logger.info(f"Faucet funding successful: {result}")
-                    else:
-                        logger.warning(f"Faucet funding failed: {response.status}")
+            async with session.post(self.faucet_url, json=faucet_request) as response:
+                if response.status == 200:
+                    result = await response.json()
+                    logger.info("Faucet funding successful: %s", result)
+                else:
+                    logger.warning("Faucet funding failed: %d", response.status)
                         
         except Exception as e:
-            logger.warning(f"Faucet funding failed: {e}")
+            logger.warning("Faucet funding failed: %s", e)
     
     async def get_account_info(self) -> Dict[str, Any]:
         """Get comprehensive account information"""
         try:
-            if not self.connected or not self.info:
+            if not self._is_connected_flag:
                 raise ValueError("Not connected to Aptos network")
             
-            # Get basic account info
-            account_info = await self.info.get_account_info(self.address)
-            
-            # Get portfolio
-            portfolio = await self.info.get_account_portfolio(self.address)
-            
-            # Get staking info
-            staking_info = await self.info.get_staking_info(self.address)
+            # Account info, portfolio and staking info are independent - fetch them together
+            account_info, portfolio, staking_info = await asyncio.gather(
+                self.info.get_account_info(self.address),
+                self.info.get_account_portfolio(self.address),
+                self.info.get_staking_info(self.address),
+                return_exceptions=True
+            )
+            if isinstance(account_info, Exception):
+                logger.warning("Error getting account details: %s", account_info)
+                account_info = {}
+            if isinstance(portfolio, Exception):
+                logger.warning("Error getting portfolio: %s", portfolio)
+                portfolio = {}
+            if isinstance(staking_info, Exception):
+                logger.warning("Error getting staking info: %s", staking_info)
+                staking_info = {}
             
             return {
                 'address': self.address,
@@ -310,7 +464,7 @@ class AptosAuth:
             }
             
         except Exception as e:
-            logger.error(f"Error getting account info: {e}")
+            logger.error("Error getting account info: %s", e)
             return {}
     
     async def reconnect(self) -> bool:
@@ -319,15 +473,15 @@ class AptosAuth:
             return False
         
         try:
-            await self.connect(force_refresh=True)
+            await self._connect(force_refresh=True)
             return True
         except Exception as e:
-            logger.error(f"Reconnection failed: {e}")
+            logger.error("Reconnection failed: %s", e)
             return False
     
     def is_connected(self) -> bool:
         """Check if currently connected"""
-        return self.connected and self.address and self.info and self.exchange
+        return self._is_connected_flag
     
     def get_connection_status(self) -> Dict[str, Any]:
         """Get detailed connection status"""
@@ -344,20 +498,22 @@ class AptosAuth:
     async def close(self):
         """Clean up connections"""
         try:
-            if self.info:
-                await self.info.close()
-            if self.exchange:
-                await self.exchange.close()
+            await self._close_clients()
+            if self._session is not None and not self._session.closed:
+                await self._session.close()
+            self._session = None
+            if self._client is not None:
+                await self._client.close()
+            self._client = None
             
             self.connected = False
+            self._is_connected_flag = False
             self.address = None
-            self.info = None
-            self.exchange = None
             
             logger.info("Aptos authentication closed")
             
         except Exception as e:
-            logger.error(f"Error closing connections: {e}")
+            logger.error("Error closing connections: %s", e)
 
 # Convenience function for quick setup
 async def setup_aptos_auth(
@@ -377,4 +533,5 @@ async def setup_aptos_auth(
         auto_reconnect=auto_reconnect
     )
     
-    return await auth.connect()
+    address = await auth.connect()
+    return address, auth.info, auth.exchange
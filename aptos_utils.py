@@ -3,19 +3,119 @@ Aptos utilities for setup and configuration
 Equivalent to Hyperliquid's example_utils.py but for Aptos
 """
 
+import asyncio
+import hashlib
 import json
 import os
 import logging
-from typing import Tuple, List, Optional
+import time
+from types import MappingProxyType
+from typing import Any, Dict, Tuple, List, Optional
 
+import aiohttp
+from nacl.signing import SigningKey
+from aptos_sdk import ed25519
 from aptos_sdk.account import Account
+from aptos_sdk.account_address import AccountAddress
 from aptos_sdk.async_client import RestClient
 
 from aptos.exchange import AptosExchange
 from aptos.info import AptosInfo
+from file_utils import load_json_cached, write_atomic
+
+# orjson is optional - stdlib json is the fallback codec for config files
+try:
+    import orjson
+    
+    def _jdumps(obj: Any) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+except ImportError:
+    def _jdumps(obj: Any) -> bytes:
+        return json.dumps(obj, indent=2).encode()
 
 logger = logging.getLogger(__name__)
 
+# Network name -> (node URL, faucet URL or None)
+_NETWORK_URLS = MappingProxyType({
+    "mainnet": ("https://fullnode.mainnet.aptoslabs.com/v1", None),
+    "testnet": ("https://fullnode.testnet.aptoslabs.com/v1", "https://faucet.testnet.aptoslabs.com"),
+    "devnet": ("https://fullnode.devnet.aptoslabs.com/v1", "https://faucet.devnet.aptoslabs.com"),
+})
+
+def network_urls(network: str) -> Tuple[str, Optional[str]]:
+    """Node and faucet URLs for a network; unknown names get testnet"""
+    return _NETWORK_URLS.get(network) or _NETWORK_URLS["testnet"]
+
+def _write_json(path: str, obj: Any):
+    """Serialize obj and write it to path"""
+    write_atomic(path, _jdumps(obj))
+
+async def load_json_async(path: str) -> Dict[str, Any]:
+    """load_json_cached on a worker thread so file I/O does not block the event loop"""
+    return await asyncio.get_running_loop().run_in_executor(None, load_json_cached, path)
+
+async def write_json_async(path: str, obj: Any):
+    """_write_json on a worker thread so file I/O does not block the event loop"""
+    await asyncio.get_running_loop().run_in_executor(None, _write_json, path, obj)
+
+def load_account(private_key: str) -> Account:
+    """
+    Account for a private key in any format Account.load_key accepts
+    A malformed key raises ValueError so callers can treat it as permanent
+    """
+    if not private_key:
+        raise ValueError("No private key provided")
+    try:
+        return Account.load_key(private_key)
+    except Exception as e:
+        raise ValueError(f"Invalid private key: {e}") from e
+
+def get_account_address(account: Account) -> str:
+    """Address string of an account, hex-encoded once and kept on the account"""
+    address = getattr(account, "_cached_addr", None)
+    if address is None:
+        address = account._cached_addr = str(account.address())
+    return address
+
+def generate_account() -> Tuple[Account, str, str]:
+    """
+    Generate a new account from one libsodium keypair
+    Returns (account, private_key_hex, public_key_hex); the address string is cached on the account
+    """
+    signing_key = SigningKey.generate()
+    public_key = bytes(signing_key.verify_key)
+    # Aptos address = sha3-256(public key || single-key ed25519 scheme byte)
+    address = hashlib.sha3_256(public_key + b'\x00').digest()
+    
+    account = Account(AccountAddress(address), ed25519.PrivateKey(signing_key))
+    account._cached_addr = "0x" + address.hex()
+    return account, bytes(signing_key).hex(), public_key.hex()
+
+# Default config layout, serialized once; each quoted token is swapped for a JSON value per call
+_DEFAULT_CONFIG_TEMPLATE = _jdumps({
+    "general": {
+        "environment": "{{NETWORK}}",
+        "node_url": "{{NODE_URL}}",
+        "faucet_url": "{{FAUCET}}"
+    },
+    "aptos": {
+        "admin_private_key": "{{PK}}",
+        "account_address": "{{ADDRESS}}",
+        "network": "{{NETWORK}}"
+    },
+    "telegram_bot": {
+        "bot_token": "YOUR_BOT_TOKEN_HERE",
+        "allowed_users": [],
+        "admin_users": []
+    },
+    "trading": {
+        "default_slippage": 0.05,
+        "max_gas_amount": 10000,
+        "gas_unit_price": 100
+    },
+    "created_at": "{{TS}}"
+})
+
 async def setup(
     node_url: Optional[str] = None,
     config_path: Optional[str] = None,
@@ -37,15 +137,11 @@ async def setup(
         config_path = os.path.join(os.path.dirname(__file__), "config.json")
     
     if not node_url:
-        if network == "mainnet":
-            node_url = "https://fullnode.mainnet.aptoslabs.com/v1"
-        else:
-            node_url = "https://fullnode.testnet.aptoslabs.com/v1"
+        node_url = network_urls(network)[0]
     
     # Load configuration
     try:
-        with open(config_path) as f:
-            config = json.load(f)
+        config = await load_json_async(config_path)
     except FileNotFoundError:
         logger.error(f"Config file not found: {config_path}")
         raise Exception(f"Config file not found: {config_path}")
@@ -70,15 +166,13 @@ async def setup(
     
     # Create account from private key
     try:
-        if private_key.startswith('0x'):
-            private_key = private_key[2:]  # Remove 0x prefix if present
-        account = Account.load_key(private_key)
+        account = load_account(private_key)
     except Exception as e:
         logger.error(f"Invalid private key: {e}")
         raise Exception(f"Invalid private key format: {e}")
     
     # Determine address
-    derived_address = str(account.address())
+    derived_address = get_account_address(account)
     if account_address and account_address != "":
         if account_address != derived_address:
             logger.warning(f"Config address {account_address} differs from derived address {derived_address}")
@@ -91,14 +185,16 @@ async def setup(
     print(f"Network: {network}")
     print(f"Node URL: {node_url}")
     
-    # Initialize info and exchange
-    info = AptosInfo(node_url)
+    # Initialize info and exchange (sharing one node client)
     exchange = AptosExchange(account, node_url)
+    info = exchange.info
     
     # Check account has balance
     try:
-        balance = await info.get_account_balance(address)
-        portfolio = await info.get_account_portfolio(address)
+        balance, portfolio = await asyncio.gather(
+            info.get_account_balance(address),
+            info.get_account_portfolio(address)
+        )
         
         if balance == 0 and portfolio.get("total_value_usd", 0) == 0:
             logger.warning("Account has no APT balance")
@@ -109,7 +205,6 @@ async def setup(
                 try:
                     await fund_from_faucet(address)
                     # Wait a bit and check again
-                    import asyncio
                     await asyncio.sleep(5)
                     balance = await info.get_account_balance(address)
                     if balance > 0:
@@ -144,28 +239,29 @@ Current balance: {balance / 100000000:.8f} APT
     
     return address, info, exchange
 
-async def fund_from_faucet(address: str, amount: int = 100000000) -> bool:
+async def fund_from_faucet(address: str, amount: int = 100000000, session=None) -> bool:
     """
     Fund account from Aptos testnet faucet
     
     Args:
         address: Account address to fund
         amount: Amount in octas (default 1 APT)
+        session: Existing aiohttp session to reuse (optional)
     
     Returns:
         True if successful, False otherwise
     """
     try:
-        import aiohttp
-        
         faucet_url = "https://faucet.testnet.aptoslabs.com"
+        faucet_request = {
+            "address": address,
+            "amount": amount
+        }
         
-        async with aiohttp.ClientSession() as session:
-            faucet_request = {
-                "address": address,
-                "amount": amount
-            }
-            
+        owns_session = session is None
+        if owns_session:
+            session = aiohttp.ClientSession()
+        try:
             async with session.post(faucet_url, json=faucet_request) as response:
                 if response.status == 200:
                     result = await response.json()
@@ -174,6 +270,9 @@ async def fund_from_faucet(address: str, amount: int = 100000000) -> bool:
                 else:
                     logger.error(f"Faucet funding failed: {response.status}")
                     return False
+        finally:
+            if owns_session:
+                await session.close()
                     
     except Exception as e:
         logger.error(f"Faucet funding error: {e}")
@@ -186,13 +285,13 @@ def generate_new_account() -> Tuple[Account, str]:
     Returns:
         Tuple of (account, address)
     """
-    account = Account.generate()
-    address = str(account.address())
+    account, private_key_hex, public_key_hex = generate_account()
+    address = get_account_address(account)
     
     print(f"Generated new Aptos account:")
     print(f"Address: {address}")
-    print(f"Private Key: 0x{account.private_key.hex()}")
-    print(f"Public Key: 0x{account.public_key.hex()}")
+    print(f"Private Key: 0x{private_key_hex}")
+    print(f"Public Key: 0x{public_key_hex}")
     print("\n⚠️  IMPORTANT: Save your private key securely!")
     print("⚠️  Never share your private key with anyone!")
     
@@ -215,15 +314,14 @@ def save_account_config(
         Path to saved config file
     """
     config = {
-        "address": str(account.address()),
+        "address": get_account_address(account),
         "private_key": f"0x{account.private_key.hex()}",
         "public_key": f"0x{account.public_key.hex()}",
         "network": network,
         "created_at": int(time.time())
     }
     
-    with open(config_path, 'w') as f:
-        json.dump(config, f, indent=2)
+    _write_json(config_path, config)
     
     print(f"Account configuration saved to: {config_path}")
     return config_path
@@ -239,15 +337,10 @@ def load_account_from_config(config_path: str) -> Tuple[Account, str]:
         Tuple of (account, address)
     """
     try:
-        with open(config_path) as f:
-            config = json.load(f)
-        
-        private_key = config.get("private_key", "")
-        if private_key.startswith('0x'):
-            private_key = private_key[2:]
+        config = load_json_cached(config_path)
         
-        account = Account.load_key(private_key)
-        address = str(account.address())
+        account = load_account(config.get("private_key", ""))
+        address = get_account_address(account)
         
         # Verify address matches config
         config_address = config.get("address", "")
@@ -260,6 +353,18 @@ def load_account_from_config(config_path: str) -> Tuple[Account, str]:
         logger.error(f"Failed to load account from config: {e}")
         raise
 
+def _load_multi_account(account_config: Dict[str, Any], i: int) -> Tuple[Account, str]:
+    """Derive one multi-account entry and check it against its configured address"""
+    account = load_account(account_config.get("private_key", ""))
+    address = get_account_address(account)
+    
+    # Verify address if provided
+    config_address = account_config.get("address", "")
+    if config_address and config_address != address:
+        raise Exception(f"Account {i}: provided address {config_address} does not match private key")
+    
+    return account, address
+
 async def setup_multi_accounts(config_path: str) -> List[Tuple[Account, str]]:
     """
     Setup multiple accounts from configuration
@@ -271,29 +376,21 @@ async def setup_multi_accounts(config_path: str) -> List[Tuple[Account, str]]:
         List of (account, address) tuples
     """
     try:
-        with open(config_path) as f:
-            config = json.load(f)
+        config = await load_json_async(config_path)
         
-        accounts = []
         multi_account_config = config.get("multi_accounts", [])
         
-        for i, account_config in enumerate(multi_account_config):
-            private_key = account_config.get("private_key", "")
-            if private_key.startswith('0x'):
-                private_key = private_key[2:]
-            
-            account = Account.load_key(private_key)
-            address = str(account.address())
-            
-            # Verify address if provided
-            config_address = account_config.get("address", "")
-            if config_address and config_address != address:
-                raise Exception(f"Account {i}: provided address {config_address} does not match private key")
-            
-            accounts.append((account, address))
+        # Key derivation is independent per account - run it on worker threads
+        loop = asyncio.get_running_loop()
+        accounts = await asyncio.gather(*(
+            loop.run_in_executor(None, _load_multi_account, account_config, i)
+            for i, account_config in enumerate(multi_account_config)
+        ))
+        
+        for i, (_, address) in enumerate(accounts):
             print(f"Loaded account {i}: {address}")
         
-        return accounts
+        return list(accounts)
         
     except Exception as e:
         logger.error(f"Failed to setup multi-accounts: {e}")
@@ -315,49 +412,30 @@ def create_default_config(
     Returns:
         Path to created config file
     """
-    import time
-    
     # Generate account if no private key provided
     if not private_key:
-        account = Account.generate()
-        private_key = f"0x{account.private_key.hex()}"
-        address = str(account.address())
+        account, private_key_hex, _ = generate_account()
+        private_key = f"0x{private_key_hex}"
+        address = get_account_address(account)
         print(f"Generated new account: {address}")
     else:
-        if private_key.startswith('0x'):
-            pk = private_key[2:]
-        else:
-            pk = private_key
-        account = Account.load_key(pk)
-        address = str(account.address())
-    
-    # Create configuration
-    config = {
-        "general": {
-            "environment": network,
-            "node_url": "https://fullnode.testnet.aptoslabs.com/v1" if network == "testnet" else "https://fullnode.mainnet.aptoslabs.com/v1",
-            "faucet_url": "https://faucet.testnet.aptoslabs.com" if network == "testnet" else None
-        },
-        "aptos": {
-            "admin_private_key": private_key,
-            "account_address": address,
-            "network": network
-        },
-        "telegram_bot": {
-            "bot_token": "YOUR_BOT_TOKEN_HERE",
-            "allowed_users": [],
-            "admin_users": []
-        },
-        "trading": {
-            "default_slippage": 0.05,
-            "max_gas_amount": 10000,
-            "gas_unit_price": 100
-        },
-        "created_at": int(time.time())
-    }
-    
-    with open(config_path, 'w') as f:
-        json.dump(config, f, indent=2)
+        account = load_account(private_key)
+        address = get_account_address(account)
+    
+    # Fill in the pre-serialized configuration
+    node_url, faucet_url = network_urls(network)
+    out = _DEFAULT_CONFIG_TEMPLATE
+    for token, value in (
+        (b'"{{NETWORK}}"', network),
+        (b'"{{NODE_URL}}"', node_url),
+        (b'"{{FAUCET}}"', faucet_url),
+        (b'"{{PK}}"', private_key),
+        (b'"{{ADDRESS}}"', address),
+        (b'"{{TS}}"', int(time.time())),
+    ):
+        out = out.replace(token, _jdumps(value))
+    
+    write_atomic(config_path, out)
     
     print(f"Default configuration created: {config_path}")
     print(f"Account address: {address}")
@@ -3,15 +3,87 @@ Configuration management system for the Aptos Alpha trading bot.
 Centralizes all configurable parameters and provides methods to access and update them.
 """
 
+import asyncio
+import atexit
+import functools
 import json
 import os
 import logging
-from typing import Dict, Any, Optional, List, Union
+import threading
+from collections import ChainMap
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
+from typing import Dict, Any, Mapping, Optional, List, Tuple
 from pathlib import Path
-import copy
+
+from cachetools import LRUCache
+
+from file_utils import load_json, load_json_cached, write_atomic
 
 logger = logging.getLogger(__name__)
 
+def _json_default(obj: Any) -> Any:
+    """Encode read-only and layered mappings (MappingProxyType, ChainMap) as plain objects"""
+    if isinstance(obj, (MappingProxyType, ChainMap)):
+        return dict(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+# orjson is optional - stdlib json is the fallback for config reads and writes
+try:
+    import orjson
+    
+    def _dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj, default=_json_default, option=orjson.OPT_INDENT_2)
+    
+    def _dumps_line(obj: Any) -> bytes:
+        return orjson.dumps(obj, default=_json_default, option=orjson.OPT_APPEND_NEWLINE)
+    
+    _loads = orjson.loads
+except ImportError:
+    def _dumps(obj: Any) -> bytes:
+        return json.dumps(obj, default=_json_default, indent=2).encode()
+    
+    def _dumps_line(obj: Any) -> bytes:
+        return (json.dumps(obj, default=_json_default) + "\n").encode()
+    
+    _loads = json.loads
+
+def _read_bytes(path: str) -> bytes:
+    with open(path, 'rb') as f:
+        return f.read()
+
+def _flatten(config: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Map every dotted key path in config to its value
+    Both leaves and nested dicts get an entry, so "trading.dex_contracts" still returns the dict
+    """
+    flat = {}
+    stack = [("", config)]
+    while stack:
+        prefix, node = stack.pop()
+        for key, value in node.items():
+            path = prefix + key
+            flat[path] = value
+            if type(value) is dict:
+                stack.append((path + ".", value))
+    return flat
+
+def _freeze(obj: Any) -> Any:
+    """Read-only view of a JSON tree: dicts become MappingProxyType, lists become tuples"""
+    if isinstance(obj, dict):
+        return MappingProxyType({key: _freeze(value) for key, value in obj.items()})
+    if isinstance(obj, list):
+        return tuple(_freeze(item) for item in obj)
+    return obj
+
+def _thaw(obj: Any) -> Any:
+    """Plain mutable deep copy of a config tree, including read-only and layered parts"""
+    if isinstance(obj, Mapping):
+        return {key: _thaw(value) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_thaw(item) for item in obj]
+    return obj
+
 class ConfigManager:
     """
     Configuration manager for centralized access to all bot settings
@@ -152,6 +224,39 @@ class ConfigManager:
         }
     }
     
+    # Serialized once; parsing this is a cheap deep copy of the defaults
+    _DEFAULT_CONFIG_JSON = json.dumps(DEFAULT_CONFIG)
+    
+    # Delay before coalesced user preference writes hit disk (seconds)
+    USER_FLUSH_DELAY = 0.5
+    # Journaled preference changes kept per user before the config file is rewritten in full
+    USER_JOURNAL_MAX = 32
+    
+    # Layout for export_config_summary, filled with a single %-format
+    _SUMMARY_TEMPLATE = (
+        "📊 Aptos Alpha Bot Configuration Summary\n"
+        "----------------------------------------\n"
+        "Environment: %s\n"
+        "Node URL: %s\n"
+        "Admin Users: %s\n"
+        "Allowed Users: %s\n"
+        "Min Funding: %s APT\n"
+        "Max Leverage: %sx\n"
+        "Enabled Strategies: %s\n"
+        "\n"
+        "Risk Management:\n"
+        "- Max Daily Loss: %s%%\n"
+        "- Position Limit: %s%%\n"
+        "- Max Positions: %s\n"
+        "- Stop Loss: %s%%\n"
+        "- Take Profit: %s%%\n"
+        "\n"
+        "Aptos Configuration:\n"
+        "- Gas Unit Price: %s octas\n"
+        "- Max Gas Amount: %s\n"
+        "- DEX Contracts: %s"
+    )
+    
     def __init__(self, config_path: str = "config.json", user_config_dir: str = "user_configs"):
         """
         Initialize the configuration manager
@@ -162,10 +267,59 @@ class ConfigManager:
         """
         self.config_path = config_path
         self.user_config_dir = user_config_dir
-        self.config = self._load_config()
-        self.user_configs = {}
+        # Config files are read on first access to .config / get()
+        self._config: Optional[Dict[str, Any]] = None
+        self._load_lock = threading.Lock()
+        # Bounded LRU of user configs, created on first use so its size can come from config
+        self._user_configs: Optional[LRUCache] = None
+        # Every dotted key path -> value, rebuilt whenever set() changes the tree
+        self._flat: Optional[Dict[str, Any]] = None
+        # Telegram access lists as sets for O(1) membership checks
+        self._allowed_set: frozenset = frozenset()
+        self._admin_set: frozenset = frozenset()
+        # Read-only default user preferences shared by every user config (rebuilt after set())
+        self._default_user_proxy: Optional[Mapping[str, Any]] = None
+        # User configs changed since the last flush, and the pending flush timer
+        self._dirty_users: Dict[int, ChainMap] = {}
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        # Preference changes not yet on disk, and entries already in each user's journal file
+        self._user_journal: Dict[int, List[Tuple[str, Any]]] = {}
+        self._journal_lengths: Dict[int, int] = {}
         self._ensure_user_config_dir()
     
+    @property
+    def config(self) -> Dict[str, Any]:
+        """Merged configuration, loaded on first access"""
+        config = self._config
+        if config is None:
+            with self._load_lock:
+                if self._config is None:
+                    loaded = self._load_config()
+                    self._reindex(loaded)
+                    self._config = loaded
+                config = self._config
+        return config
+    
+    @config.setter
+    def config(self, value: Dict[str, Any]):
+        self._config = value
+        self._reindex(value)
+    
+    @property
+    def user_configs(self) -> LRUCache:
+        """Most recently used user configs, capped at performance.user_cache_size entries"""
+        cache = self._user_configs
+        if cache is None:
+            cache = self._user_configs = LRUCache(maxsize=self.get("performance.user_cache_size", 2048))
+        return cache
+    
+    def _reindex(self, config: Dict[str, Any]):
+        """Rebuild the lookup structures derived from config"""
+        flat = _flatten(config)
+        self._allowed_set = frozenset(flat.get("telegram_bot.allowed_users") or ())
+        self._admin_set = frozenset(flat.get("telegram_bot.admin_users") or ())
+        self._flat = flat
+    
     def _ensure_user_config_dir(self):
         """Ensure user config directory exists"""
         os.makedirs(self.user_config_dir, exist_ok=True)
@@ -174,35 +328,48 @@ class ConfigManager:
         """Load configuration from file or create default"""
         try:
             # Start with default config
-            merged_config = copy.deepcopy(self.DEFAULT_CONFIG)
+            merged_config = _loads(self._DEFAULT_CONFIG_JSON)
             
             # Load bot_config.json if exists (detailed config)
-            if os.path.exists("bot_config.json"):
-                with open("bot_config.json", 'r') as f:
-                    bot_config = json.load(f)
+            # The stat in load_json_cached doubles as the existence check
+            try:
+                bot_config = load_json_cached("bot_config.json")
+            except FileNotFoundError:
+                pass
+            else:
                 merged_config = self._deep_merge(merged_config, bot_config)
             
             # Load config.json if exists (override with runtime config)
-            if os.path.exists(self.config_path):
-                with open(self.config_path, 'r') as f:
-                    config = json.load(f)
-                merged_config = self._deep_merge(merged_config, config)
-                
-                # Set node URL based on environment if not explicitly set
-                if merged_config["general"]["environment"] == "mainnet":
-                    merged_config["general"]["node_url"] = "https://fullnode.mainnet.aptoslabs.com/v1"
-                    merged_config["general"]["faucet_url"] = None  # No faucet on mainnet
-                elif merged_config["general"]["environment"] == "testnet":
-                    merged_config["general"]["node_url"] = "https://fullnode.testnet.aptoslabs.com/v1"
-                    merged_config["general"]["faucet_url"] = "https://faucet.testnet.aptoslabs.com"
-                
-                return merged_config
-            else:
+            try:
+                config = load_json_cached(self.config_path)
+            except FileNotFoundError:
                 logger.info(f"Config file {self.config_path} not found")
                 return merged_config
+            
+            merged_config = self._deep_merge(merged_config, config)
+            
+            # Set node URL based on environment if not explicitly set
+            if merged_config["general"]["environment"] == "mainnet":
+                merged_config["general"]["node_url"] = "https://fullnode.mainnet.aptoslabs.com/v1"
+                merged_config["general"]["faucet_url"] = None  # No faucet on mainnet
+            elif merged_config["general"]["environment"] == "testnet":
+                merged_config["general"]["node_url"] = "https://fullnode.testnet.aptoslabs.com/v1"
+                merged_config["general"]["faucet_url"] = "https://faucet.testnet.aptoslabs.com"
+            
+            return merged_config
         except Exception as e:
             logger.error(f"Error loading config: {e}")
-            return copy.deepcopy(self.DEFAULT_CONFIG)
+            return _loads(self._DEFAULT_CONFIG_JSON)
+    
+    def _user_defaults(self) -> Mapping[str, Any]:
+        """Shared read-only default user preferences"""
+        if self._default_user_proxy is None:
+            self._default_user_proxy = _freeze(self.config["user_preferences"]["default"])
+        return self._default_user_proxy
+    
+    def _new_user_config(self, overrides: Optional[Dict[str, Any]] = None) -> ChainMap:
+        """User config as that user's overrides layered over the shared defaults"""
+        return ChainMap(overrides if overrides is not None else {}, self._user_defaults())
     
     def _deep_merge(self, base: Dict, override: Dict) -> Dict:
         """
@@ -215,11 +382,20 @@ class ConfigManager:
         Returns:
             Merged dictionary
         """
-        for key, value in override.items():
-            if key in base and isinstance(base[key], dict) and isinstance(value, dict):
-                self._deep_merge(base[key], value)
-            else:
-                base[key] = value
+        if not override:
+            return base
+        
+        # Walk nested dicts with an explicit stack instead of recursing
+        stack = [(base, override)]
+        while stack:
+            base_sub, override_sub = stack.pop()
+            for key, value in override_sub.items():
+                base_value = base_sub.get(key)
+                # Configs are plain JSON, so an exact type check is enough (and cheaper)
+                if type(base_value) is dict and type(value) is dict:
+                    stack.append((base_value, value))
+                else:
+                    base_sub[key] = value
         return base
 
     def save_config(self, config: Dict = None):
@@ -230,8 +406,7 @@ class ConfigManager:
             config: Configuration to save, defaults to current config
         """
         try:
-            with open(self.config_path, 'w') as f:
-                json.dump(config or self.config, f, indent=2)
+            write_atomic(self.config_path, _dumps(config or self.config))
             logger.info(f"Configuration saved to {self.config_path}")
         except Exception as e:
             logger.error(f"Error saving config: {e}")
@@ -247,16 +422,11 @@ class ConfigManager:
         Returns:
             Configuration value or default
         """
-        keys = key_path.split('.')
-        value = self.config
-        
-        for key in keys:
-            if isinstance(value, dict) and key in value:
-                value = value[key]
-            else:
-                return default
-        
-        return value
+        flat = self._flat
+        if flat is None:
+            self.config
+            flat = self._flat
+        return flat.get(key_path, default)
     
     def set(self, key_path: str, value: Any, save: bool = True) -> bool:
         """
@@ -271,17 +441,26 @@ class ConfigManager:
             True if successful, False otherwise
         """
         try:
-            keys = key_path.split('.')
             config = self.config
             
             # Navigate to the parent of the target key
-            for key in keys[:-1]:
+            key, sep, rest = key_path.partition('.')
+            while sep:
                 if key not in config:
                     config[key] = {}
                 config = config[key]
+                key, sep, rest = rest.partition('.')
             
             # Set the value
-            config[keys[-1]] = value
+            config[key] = value
+            self._reindex(self.config)
+            self._default_user_proxy = None
+            # Re-layer cached (and evicted but unflushed) user configs over the new defaults
+            defaults = self._user_defaults()
+            for user_config in (*self.user_configs.values(), *self._dirty_users.values()):
+                user_config.maps[1] = defaults
+            if self is config_manager:
+                _clear_helper_caches()
             
             # Save if requested
             if save:
@@ -300,39 +479,136 @@ class ConfigManager:
             user_id: User ID
             
         Returns:
-            User configuration
+            User configuration as a plain dict (a private copy - changing it
+            has no effect until passed to save_user_config)
         """
+        return _thaw(self._load_user_layers(user_id))
+    
+    def _load_user_layers(self, user_id: int) -> ChainMap:
+        """The cached user config: the user's own settings layered over the shared defaults"""
         # Return cached config if available
-        if user_id in self.user_configs:
-            return self.user_configs[user_id]
+        user_configs = self.user_configs
+        if user_id in user_configs:
+            return user_configs[user_id]
+        
+        # An evicted config with unflushed changes is newer than the file on disk
+        user_config = self._dirty_users.get(user_id)
+        if user_config is not None:
+            user_configs[user_id] = user_config
+            return user_config
         
         user_config_path = os.path.join(self.user_config_dir, f"user_{user_id}.json")
         
         try:
-            if os.path.exists(user_config_path):
-                with open(user_config_path, 'r') as f:
-                    user_config = json.load(f)
-                
-                # Cache the config
-                self.user_configs[user_id] = user_config
-                return user_config
-            else:
-                # Create default user config based on global defaults
-                default_user_config = copy.deepcopy(self.config["user_preferences"]["default"])
-                self.save_user_config(user_id, default_user_config)
-                return default_user_config
+            # Per-user files are held by the bounded user_configs cache, not the shared parse cache
+            user_config = self._new_user_config(load_json(user_config_path))
+            self._replay_journal(user_id, user_config)
+            
+            # Cache the config
+            self.user_configs[user_id] = user_config
+            return user_config
+        except FileNotFoundError:
+            # New users start with no overrides on top of the global defaults
+            default_user_config = self._new_user_config()
+            self.save_user_config(user_id, default_user_config)
+            return default_user_config
         except Exception as e:
             logger.error(f"Error loading user config for {user_id}: {e}")
             # Return default user preferences
-            return copy.deepcopy(self.config["user_preferences"]["default"])
+            return self._new_user_config()
+    
+    def _journal_path(self, user_id: int) -> str:
+        return os.path.join(self.user_config_dir, f"user_{user_id}.journal")
+    
+    def _replay_journal(self, user_id: int, user_config: ChainMap):
+        """Apply journaled preference changes written since the config file was last rewritten"""
+        try:
+            data = _read_bytes(self._journal_path(user_id))
+        except FileNotFoundError:
+            self._journal_lengths[user_id] = 0
+            return
+        
+        count = 0
+        for line in data.splitlines():
+            if not line:
+                continue
+            try:
+                key_path, value = _loads(line)
+            except ValueError:
+                # Torn final append from a crash - everything before it is intact,
+                # and leaving no length forces the next flush to compact the journal away
+                logger.warning(f"Ignoring corrupt journal entry for user {user_id}")
+                self._journal_lengths.pop(user_id, None)
+                return
+            self._apply_user_change(user_config, key_path, value)
+            count += 1
+        self._journal_lengths[user_id] = count
     
-    def save_user_config(self, user_id: int, user_config: Dict[str, Any]) -> bool:
+    @staticmethod
+    def _apply_user_change(user_config: ChainMap, key_path: str, value: Any):
+        """Set a dotted key path in the user's own layer, never the shared defaults"""
+        config = user_config.maps[0]
+        
+        # Navigate to the parent of the target key
+        key, sep, rest = key_path.partition('.')
+        if sep and key not in config:
+            # Copy-on-write: take a private copy of the default subtree being changed
+            default = user_config.maps[1].get(key)
+            config[key] = _thaw(default) if isinstance(default, MappingProxyType) else {}
+        while sep:
+            if key not in config:
+                config[key] = {}
+            config = config[key]
+            key, sep, rest = rest.partition('.')
+        
+        # Set the value
+        config[key] = value
+    
+    def preload_all(self) -> int:
+        """
+        Load every saved user config into the cache in one batch
+        
+        Returns:
+            Number of user configs loaded
+        """
+        paths = {}
+        with os.scandir(self.user_config_dir) as it:
+            for entry in it:
+                name = entry.name
+                if name.startswith("user_") and name.endswith(".json"):
+                    try:
+                        user_id = int(name[5:-5])
+                    except ValueError:
+                        continue
+                    # Keep cached configs - they may hold changes not yet flushed
+                    if user_id not in self.user_configs:
+                        paths[user_id] = entry.path
+        
+        if not paths:
+            return 0
+        
+        loaded = 0
+        with ThreadPoolExecutor() as executor:
+            futures = {user_id: executor.submit(_read_bytes, path) for user_id, path in paths.items()}
+            for user_id, future in futures.items():
+                try:
+                    user_config = self._new_user_config(_loads(future.result()))
+                    self._replay_journal(user_id, user_config)
+                    self.user_configs[user_id] = user_config
+                    loaded += 1
+                except Exception as e:
+                    logger.error(f"Error loading user config for {user_id}: {e}")
+        
+        logger.info(f"Preloaded {loaded} user configs")
+        return loaded
+    
+    def save_user_config(self, user_id: int, user_config: Mapping[str, Any]) -> bool:
         """
         Save user-specific configuration
         
         Args:
             user_id: User ID
-            user_config: User configuration
+            user_config: User configuration (only settings that differ from the defaults are written)
             
         Returns:
             True if successful, False otherwise
@@ -340,8 +616,23 @@ class ConfigManager:
         try:
             user_config_path = os.path.join(self.user_config_dir, f"user_{user_id}.json")
             
-            with open(user_config_path, 'w') as f:
-                json.dump(user_config, f, indent=2)
+            if not isinstance(user_config, ChainMap):
+                # Keep only the settings that differ from the defaults as the user's layer
+                defaults = self._user_defaults()
+                user_config = self._new_user_config({
+                    key: _thaw(value) for key, value in user_config.items()
+                    if key not in defaults or _thaw(defaults[key]) != value
+                })
+            write_atomic(user_config_path, _dumps(user_config.maps[0]))
+            
+            # The full rewrite supersedes any journaled changes
+            self._user_journal.pop(user_id, None)
+            if self._journal_lengths.get(user_id) != 0:
+                try:
+                    os.remove(self._journal_path(user_id))
+                except FileNotFoundError:
+                    pass
+                self._journal_lengths[user_id] = 0
             
             # Update cache
             self.user_configs[user_id] = user_config
@@ -352,6 +643,42 @@ class ConfigManager:
             logger.error(f"Error saving user config for {user_id}: {e}")
             return False
     
+    def _mark_user_dirty(self, user_id: int, user_config: ChainMap):
+        """Queue a user config for the next flush, scheduling one if needed"""
+        self._dirty_users[user_id] = user_config
+        if self._flush_handle is not None:
+            return
+        
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # No event loop to defer to (scripts, tests) - write straight away
+            self.flush()
+            return
+        self._flush_handle = loop.call_later(self.USER_FLUSH_DELAY, self.flush)
+    
+    def flush(self):
+        """Write all pending user config changes to disk"""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        
+        dirty, self._dirty_users = self._dirty_users, {}
+        for user_id, user_config in dirty.items():
+            changes = self._user_journal.pop(user_id, None)
+            written = self._journal_lengths.get(user_id)
+            if not changes or written is None or written + len(changes) > self.USER_JOURNAL_MAX:
+                # Compact: rewrite the whole file and start a fresh journal
+                self.save_user_config(user_id, user_config)
+                continue
+            try:
+                with open(self._journal_path(user_id), 'ab') as f:
+                    f.write(b"".join(_dumps_line(change) for change in changes))
+                self._journal_lengths[user_id] = written + len(changes)
+            except Exception as e:
+                logger.error(f"Error journaling user config for {user_id}: {e}")
+                self.save_user_config(user_id, user_config)
+    
     def get_user_preference(self, user_id: int, key_path: str, default=None) -> Any:
         """
         Get user preference by key path
@@ -364,19 +691,21 @@ class ConfigManager:
         Returns:
             Preference value or default
         """
-        user_config = self.load_user_config(user_id)
+        user_config = self._load_user_layers(user_id)
         
-        keys = key_path.split('.')
         value = user_config
+        rest, sep = key_path, '.'
         
-        for key in keys:
-            if isinstance(value, dict) and key in value:
+        while sep:
+            key, sep, rest = rest.partition('.')
+            if isinstance(value, Mapping) and key in value:
                 value = value[key]
             else:
                 # If not found in user config, check global default
                 return self.get(f"user_preferences.default.{key_path}", default)
         
-        return value
+        # Containers may be shared defaults - hand out a plain copy
+        return _thaw(value) if isinstance(value, (Mapping, list, tuple)) else value
     
     def set_user_preference(self, user_id: int, key_path: str, value: Any, save: bool = True) -> bool:
         """
@@ -392,29 +721,33 @@ class ConfigManager:
             True if successful, False otherwise
         """
         try:
-            user_config = self.load_user_config(user_id)
-            
-            keys = key_path.split('.')
-            config = user_config
+            user_config = self._load_user_layers(user_id)
+            self._apply_user_change(user_config, key_path, value)
+            # Record the change so the next flush can append it instead of rewriting the file
+            self._user_journal.setdefault(user_id, []).append((key_path, value))
             
-            # Navigate to the parent of the target key
-            for key in keys[:-1]:
-                if key not in config:
-                    config[key] = {}
-                config = config[key]
-            
-            # Set the value
-            config[keys[-1]] = value
-            
-            # Save if requested
+            # Save if requested - coalesced with other changes made shortly after
             if save:
-                self.save_user_config(user_id, user_config)
+                self._mark_user_dirty(user_id, user_config)
                 
             return True
         except Exception as e:
             logger.error(f"Error setting user preference: {e}")
             return False
     
+    def is_user_allowed(self, user_id: int) -> bool:
+        """Check if user is allowed to use the bot (an empty allow list admits everyone)"""
+        if self._flat is None:
+            self.config
+        allowed = self._allowed_set
+        return not allowed or user_id in allowed
+    
+    def is_admin_user(self, user_id: int) -> bool:
+        """Check if user is an admin"""
+        if self._flat is None:
+            self.config
+        return user_id in self._admin_set
+    
     def get_strategy_parameters(self, strategy_name: str) -> Dict[str, Any]:
         """
         Get parameters for a specific strategy
@@ -446,16 +779,12 @@ class ConfigManager:
         Returns:
             Risk limits
         """
-        user_risk = self.get_user_preference(user_id, "risk_settings", {})
+        user_risk = self.get_user_preference(user_id, "risk_settings", {}) or {}
         global_risk = self.get_risk_limits()
         
         # Use user settings where available, otherwise fall back to global
-        combined_risk = copy.deepcopy(global_risk)
-        for key, value in user_risk.items():
-            if key in combined_risk:
-                combined_risk[key] = value
-        
-        return combined_risk
+        overrides = {key: value for key, value in user_risk.items() if key in global_risk}
+        return {**global_risk, **overrides}
     
     def update_strategy_parameters(self, strategy_name: str, parameters: Dict[str, Any]) -> bool:
         """
@@ -479,50 +808,48 @@ class ConfigManager:
         Returns:
             Configuration summary
         """
-        # Get important values to display
-        env = self.get("general.environment", "testnet")
-        node_url = self.get("general.node_url", "")
-        admin_users = self.get("telegram_bot.admin_users", [])
-        allowed_users = self.get("telegram_bot.allowed_users", [])
-        min_funding = self.get("aptos_wallet.min_funding_amount", 1.0)
-        max_leverage = self.get("risk_management.max_leverage", 3.0)
-        
-        enabled_strategies = []
-        for strat, params in self.get("strategies", {}).items():
-            if params.get("enabled", False):
-                enabled_strategies.append(strat)
-        
-        # Build summary
-        summary = [
-            "📊 Aptos Alpha Bot Configuration Summary",
-            "----------------------------------------",
-            f"Environment: {env.upper()}",
-            f"Node URL: {node_url}",
-            f"Admin Users: {len(admin_users)}",
-            f"Allowed Users: {'All' if not allowed_users else len(allowed_users)}",
-            f"Min Funding: {min_funding} APT",
-            f"Max Leverage: {max_leverage}x",
-            f"Enabled Strategies: {', '.join(enabled_strategies)}",
-            "",
-            "Risk Management:",
-            f"- Max Daily Loss: {self.get('risk_management.max_daily_loss_percentage', 5.0)}%",
-            f"- Position Limit: {self.get('risk_management.position_size_limit_percentage', 20.0)}%",
-            f"- Max Positions: {self.get('risk_management.max_open_positions', 5)}",
-            f"- Stop Loss: {self.get('risk_management.stop_loss_percentage', 5.0)}%",
-            f"- Take Profit: {self.get('risk_management.take_profit_percentage', 10.0)}%",
-            "",
-            "Aptos Configuration:",
-            f"- Gas Unit Price: {self.get('aptos_wallet.default_gas_unit_price', 100)} octas",
-            f"- Max Gas Amount: {self.get('aptos_wallet.max_gas_amount', 10000)}",
-            f"- DEX Contracts: {len(self.get('trading.dex_contracts', {}))}"
-        ]
-        
-        return "\n".join(summary)
+        # Grab each section once and read the values from local references
+        config = self.config
+        gen = config.get("general", {})
+        tg = config.get("telegram_bot", {})
+        rm = config.get("risk_management", {})
+        aw = config.get("aptos_wallet", {})
+        strats = config.get("strategies", {})
+        
+        env = gen.get("environment", "testnet")
+        node_url = gen.get("node_url", "")
+        admin_users = tg.get("admin_users", [])
+        allowed_users = tg.get("allowed_users", [])
+        min_funding = aw.get("min_funding_amount", 1.0)
+        max_leverage = rm.get("max_leverage", 3.0)
+        
+        enabled_strategies = [name for name, params in strats.items() if params.get("enabled", False)]
+        
+        return self._SUMMARY_TEMPLATE % (
+            env.upper(),
+            node_url,
+            len(admin_users),
+            len(allowed_users) if allowed_users else "All",
+            min_funding,
+            max_leverage,
+            ", ".join(enabled_strategies),
+            rm.get("max_daily_loss_percentage", 5.0),
+            rm.get("position_size_limit_percentage", 20.0),
+            rm.get("max_open_positions", 5),
+            rm.get("stop_loss_percentage", 5.0),
+            rm.get("take_profit_percentage", 10.0),
+            aw.get("default_gas_unit_price", 100),
+            aw.get("max_gas_amount", 10000),
+            len(config.get("trading", {}).get("dex_contracts", {})),
+        )
 
 # Create a global instance for easy import
 config_manager = ConfigManager()
+# Don't lose preference changes still waiting for their debounced write
+atexit.register(config_manager.flush)
 
 # Helper functions for easy access
+# Fixed keys below index config_manager.config directly - DEFAULT_CONFIG guarantees they exist
 def get_config(key_path: str, default=None) -> Any:
     """Get configuration value by key path"""
     return config_manager.get(key_path, default)
@@ -551,32 +878,38 @@ def get_risk_limits() -> Dict[str, Any]:
     """Get risk management limits"""
     return config_manager.get_risk_limits()
 
+@functools.lru_cache(maxsize=None)
 def get_node_url() -> str:
     """Get Aptos node URL based on environment"""
-    return config_manager.get("general.node_url")
+    return config_manager.config["general"]["node_url"]
 
 def get_faucet_url() -> str:
     """Get Aptos faucet URL for testnet"""
-    return config_manager.get("general.faucet_url")
+    return config_manager.config["general"]["faucet_url"]
 
+@functools.lru_cache(maxsize=None)
 def is_mainnet() -> bool:
     """Check if running on mainnet"""
-    return config_manager.get("general.environment") == "mainnet"
+    return config_manager.config["general"]["environment"] == "mainnet"
 
+@functools.lru_cache(maxsize=None)
 def get_telegram_bot_token() -> str:
     """Get Telegram bot token"""
-    return config_manager.get("telegram_bot.bot_token", "")
+    return config_manager.config["telegram_bot"]["bot_token"]
+
+def _clear_helper_caches():
+    """Drop memoized helper results after the global config changes"""
+    get_node_url.cache_clear()
+    is_mainnet.cache_clear()
+    get_telegram_bot_token.cache_clear()
 
 def is_user_allowed(user_id: int) -> bool:
     """Check if user is allowed to use the bot"""
-    allowed_users = config_manager.get("telegram_bot.allowed_users", [])
-    # If allowed_users is empty, all users are allowed
-    return len(allowed_users) == 0 or user_id in allowed_users
+    return config_manager.is_user_allowed(user_id)
 
 def is_admin_user(user_id: int) -> bool:
     """Check if user is an admin"""
-    admin_users = config_manager.get("telegram_bot.admin_users", [])
-    return user_id in admin_users
+    return config_manager.is_admin_user(user_id)
 
 # Only execute if run directly
 if __name__ == "__main__":
@@ -5,41 +5,221 @@ Production-ready database with proper schema and indexing
 import sqlite3
 import asyncio
 import aiosqlite
+import copy
+import functools
 import json
 import time
 import logging
 from typing import Dict, List, Optional, Any
 from contextlib import asynccontextmanager
+from pathlib import Path
 
 logger = logging.getLogger(__name__)
 
+def db_safe(default=None):
+    """
+    Log and swallow errors from a database method, returning default instead
+    (a fresh copy, so callers may mutate it)
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            try:
+                return await func(*args, **kwargs)
+            except Exception as e:
+                logger.error(f"{func.__name__} error: {e}")
+                return copy.deepcopy(default)
+        return wrapper
+    return decorator
+
+# WAL lets readers run during writes and turns each commit into one appended write.
+# It is a property of the database file, so only the writer connection sets it
+_JOURNAL_PRAGMA = "PRAGMA journal_mode = WAL"
+
+# Per-connection tuning, applied to the writer and every reader; appends are safe to
+# sync less eagerly under WAL (synchronous=NORMAL)
+_PRAGMAS = (
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA cache_size = -64000",  # 64MB page cache
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA mmap_size = 268435456",
+    "PRAGMA busy_timeout = 5000",
+    "PRAGMA wal_autocheckpoint = 1000",
+    "PRAGMA foreign_keys = ON",
+)
+
+# Read-only connections serving fetchone/fetchall alongside the single writer
+_READER_POOL_SIZE = 4
+
+# sqlite3 keeps compiled statements per connection, keyed by exact SQL text (default 128)
+_STATEMENT_CACHE_SIZE = 256
+
+# Hot inserts share one SQL string so every call hits the same cached statement
+_INSERT_TRADE_SQL = """INSERT INTO user_trades 
+    (user_id, strategy, coin, trade_type, amount, price, fee, order_id, transaction_hash, dex_name) 
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"""
+
+_INSERT_DEFI_SQL = """INSERT INTO aptos_defi_activity 
+    (user_id, activity_type, protocol_name, amount_apt, transaction_hash, rewards_earned, dex_name, pool_address) 
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)"""
+
+_INSERT_REFERRAL_SQL = """INSERT INTO referral_commissions 
+    (referrer_id, referee_id, commission_amount, volume_generated) 
+    VALUES (?, ?, ?, ?)"""
+
 class DatabaseManager:
+    # Seconds between PRAGMA optimize runs that keep planner statistics current
+    OPTIMIZE_INTERVAL = 1800.0
+    # Minimum seconds between last_active writes for a user
+    LAST_ACTIVE_INTERVAL = 60.0
+    
     def __init__(self, db_path: str = "aptos_alpha_bot.db"):
         self.db_path = db_path
         self.conn = None
         self._initialized = False
+        # Serializes writers so a statement from one task never lands inside another task's transaction
+        self._write_lock = asyncio.Lock()
+        self._tx_owner: Optional[asyncio.Task] = None
+        # One long-lived connection: opened once even when tasks race to first use
+        self._init_lock = asyncio.Lock()
+        self._init_task: Optional[asyncio.Task] = None
+        # Idle read-only connections; None until initialized (or when readers can't be opened)
+        self._readers: Optional[asyncio.Queue] = None
+        self._optimize_task: Optional[asyncio.Task] = None
+        # user id -> time.monotonic() of the last last_active write
+        self._last_active_written: Dict[int, float] = {}
     
     async def initialize(self) -> bool:
         """MISSING METHOD - Initialize database connection and create tables"""
-        try:
-            self.conn = await aiosqlite.connect(self.db_path)
-            await self.conn.execute("PRAGMA foreign_keys = ON")
-            await self._create_tables()
-            self._initialized = True
-            logger.info(f"✅ Aptos Alpha Bot database initialized: {self.db_path}")
+        if self._initialized:
             return True
+        
+        async with self._init_lock:
+            if self._initialized:
+                return True
+            
+            self._init_task = asyncio.current_task()
+            try:
+                self.conn = await aiosqlite.connect(self.db_path, cached_statements=_STATEMENT_CACHE_SIZE)
+                # Rows index by position as before and by column name; dict(row) is built in C
+                self.conn.row_factory = sqlite3.Row
+                await self.conn.execute(_JOURNAL_PRAGMA)
+                for pragma in _PRAGMAS:
+                    await self.conn.execute(pragma)
+                await self._create_tables()
+                await self._open_readers()
+                self._optimize_task = asyncio.create_task(self._optimize_periodically())
+                self._initialized = True
+                logger.info(f"✅ Aptos Alpha Bot database initialized: {self.db_path}")
+                return True
+            except Exception as e:
+                logger.error(f"❌ Database initialization failed: {e}")
+                # Don't leave a half-set-up connection behind; the next call retries
+                if self.conn:
+                    await self.conn.close()
+                    self.conn = None
+                return False
+            finally:
+                self._init_task = None
+    
+    async def _open_readers(self):
+        """Open the read-only pool; reads fall back to the writer if this fails"""
+        if self.db_path == ":memory:":
+            return
+        
+        uri = Path(self.db_path).absolute().as_uri() + "?mode=ro"
+        readers = asyncio.Queue()
+        try:
+            for _ in range(_READER_POOL_SIZE):
+                conn = await aiosqlite.connect(uri, uri=True, cached_statements=_STATEMENT_CACHE_SIZE)
+                readers.put_nowait(conn)
+                conn.row_factory = sqlite3.Row
+                for pragma in _PRAGMAS:
+                    await conn.execute(pragma)
         except Exception as e:
-            logger.error(f"❌ Database initialization failed: {e}")
-            return False
+            logger.warning(f"Read-only connections unavailable, reading through the writer: {e}")
+            await self._close_readers(readers)
+            return
+        self._readers = readers
+    
+    @staticmethod
+    async def _close_readers(readers: asyncio.Queue):
+        while not readers.empty():
+            await readers.get_nowait().close()
+    
+    async def _read(self, query: str, params: tuple, fetch_all: bool):
+        """Run a query on an idle read-only connection, waiting for one if all are busy"""
+        conn = await self._readers.get()
+        try:
+            cursor = await conn.execute(query, params)
+            try:
+                return await cursor.fetchall() if fetch_all else await cursor.fetchone()
+            finally:
+                await cursor.close()
+        finally:
+            self._readers.put_nowait(conn)
+    
+    async def _optimize(self):
+        """Refresh statistics for tables whose query patterns or sizes changed (a cheap incremental ANALYZE)"""
+        try:
+            async with self._write_lock:
+                await self.conn.execute("PRAGMA optimize")
+        except Exception as e:
+            logger.warning(f"PRAGMA optimize failed: {e}")
+    
+    async def _optimize_periodically(self):
+        while True:
+            await asyncio.sleep(self.OPTIMIZE_INTERVAL)
+            await self._optimize()
+    
+    async def _ensure_initialized(self):
+        """Initialize on first use (initialize() itself runs the schema statements)"""
+        if not self._initialized and self._init_task is not asyncio.current_task():
+            await self.initialize()
+    
+    def _in_transaction(self) -> bool:
+        """True when the calling task holds the open transaction"""
+        return self._tx_owner is not None and self._tx_owner is asyncio.current_task()
+    
+    @asynccontextmanager
+    async def transaction(self):
+        """
+        Run several statements under a single COMMIT, rolling back if any of them fails
+        Nested use joins the outer transaction
+        """
+        if self._in_transaction():
+            yield
+            return
+        
+        await self._ensure_initialized()
+        
+        async with self._write_lock:
+            self._tx_owner = asyncio.current_task()
+            try:
+                await self.conn.execute("BEGIN")
+                try:
+                    yield
+                except BaseException:
+                    await self.conn.rollback()
+                    raise
+                await self.conn.commit()
+            finally:
+                self._tx_owner = None
     
     async def execute(self, query: str, params: tuple = ()) -> Optional[aiosqlite.Cursor]:
         """MISSING METHOD - Execute SQL query with parameters"""
+        # Inside transaction(): no commit, and errors propagate so the transaction rolls back
+        if self._in_transaction():
+            return await self.conn.execute(query, params)
+        
         try:
-            if not self.conn:
-                await self.initialize()
+            await self._ensure_initialized()
             
-            cursor = await self.conn.execute(query, params)
-            await self.conn.commit()
+            async with self._write_lock:
+                cursor = await self.conn.execute(query, params)
+                # Autocommit single statements; plain reads leave no transaction open
+                if self.conn.in_transaction:
+                    await self.conn.commit()
             return cursor
         except Exception as e:
             logger.error(f"Database execute error: {e}")
@@ -48,22 +228,35 @@ class DatabaseManager:
     async def fetchone(self, query: str, params: tuple = ()) -> Optional[tuple]:
         """Fetch single row"""
         try:
+            # Outside a transaction, reads go to the read-only pool and don't queue behind writes
+            await self._ensure_initialized()
+            if self._readers is not None and not self._in_transaction():
+                return await self._read(query, params, False)
+            
             cursor = await self.execute(query, params)
             if cursor:
                 return await cursor.fetchone()
             return None
         except Exception as e:
+            if self._in_transaction():
+                raise
             logger.error(f"Database fetchone error: {e}")
             return None
     
     async def fetchall(self, query: str, params: tuple = ()) -> List[tuple]:
         """Fetch all rows"""
         try:
+            await self._ensure_initialized()
+            if self._readers is not None and not self._in_transaction():
+                return await self._read(query, params, True)
+            
             cursor = await self.execute(query, params)
             if cursor:
                 return await cursor.fetchall()
             return []
         except Exception as e:
+            if self._in_transaction():
+                raise
             logger.error(f"Database fetchall error: {e}")
             return []
     
@@ -167,440 +360,434 @@ class DatabaseManager:
             )"""
         ]
         
-        for table_sql in tables:
-            await self.execute(table_sql)
+        # Lookup paths of the per-user queries below (users.telegram_id is already indexed by UNIQUE)
+        indexes = [
+            "CREATE INDEX IF NOT EXISTS idx_trades_user_ts ON user_trades (user_id, timestamp DESC)",
+            "CREATE INDEX IF NOT EXISTS idx_defi_user ON aptos_defi_activity (user_id)",
+            "CREATE INDEX IF NOT EXISTS idx_perf_user_date ON trading_performance (user_id, date DESC)",
+            "CREATE INDEX IF NOT EXISTS idx_vault_addr_status ON vault_users (vault_address, status)",
+            "CREATE INDEX IF NOT EXISTS idx_vault_user_addr ON vault_users (user_id, vault_address, status)",
+            "CREATE INDEX IF NOT EXISTS idx_refcomm_referrer ON referral_commissions (referrer_id)",
+            # Conflict targets for the UPSERTs in update_daily_performance and record_vault_deposit
+            "CREATE UNIQUE INDEX IF NOT EXISTS uq_perf_user_date ON trading_performance (user_id, date)",
+            "CREATE UNIQUE INDEX IF NOT EXISTS uq_vault_active ON vault_users (user_id, vault_address) WHERE status = 'active'"
+        ]
+        
+        # Rows that would block each unique index on databases created before it, keyed by
+        # index name. Duplicate performance rows were always written with identical values.
+        # Extra active vault rows are folded into the lowest-id one before being retired
+        dedupe = {
+            "uq_perf_user_date": [
+                """DELETE FROM trading_performance WHERE id NOT IN
+                   (SELECT MAX(id) FROM trading_performance GROUP BY user_id, date)"""
+            ],
+            "uq_vault_active": [
+                """UPDATE vault_users SET
+                       deposit_amount = (SELECT SUM(d.deposit_amount) FROM vault_users AS d
+                           WHERE d.status = 'active' AND d.user_id = vault_users.user_id
+                           AND d.vault_address = vault_users.vault_address),
+                       current_balance = (SELECT SUM(d.current_balance) FROM vault_users AS d
+                           WHERE d.status = 'active' AND d.user_id = vault_users.user_id
+                           AND d.vault_address = vault_users.vault_address),
+                       withdrawal_amount = (SELECT SUM(d.withdrawal_amount) FROM vault_users AS d
+                           WHERE d.status = 'active' AND d.user_id = vault_users.user_id
+                           AND d.vault_address = vault_users.vault_address),
+                       withdrawal_time = (SELECT MAX(d.withdrawal_time) FROM vault_users AS d
+                           WHERE d.status = 'active' AND d.user_id = vault_users.user_id
+                           AND d.vault_address = vault_users.vault_address)
+                   WHERE id IN (SELECT MIN(id) FROM vault_users WHERE status = 'active'
+                                GROUP BY user_id, vault_address HAVING COUNT(*) > 1)""",
+                """UPDATE vault_users SET status = 'duplicate' WHERE status = 'active' AND id NOT IN
+                   (SELECT MIN(id) FROM vault_users WHERE status = 'active' GROUP BY user_id, vault_address)"""
+            ]
+        }
+        
+        async with self.transaction():
+            for table_sql in tables:
+                await self.execute(table_sql)
+            # Only needed once, on the startup that creates the index
+            existing = {
+                row[0] for row in await self.fetchall(
+                    "SELECT name FROM sqlite_master WHERE type = 'index' AND name IN (?, ?)",
+                    tuple(dedupe)
+                )
+            }
+            for index_name, dedupe_sqls in dedupe.items():
+                if index_name not in existing:
+                    for dedupe_sql in dedupe_sqls:
+                        await self.execute(dedupe_sql)
+            for index_sql in indexes:
+                await self.execute(index_sql)
+            # Give the planner statistics for the new indexes
+            await self.execute("ANALYZE")
     
     # USER MANAGEMENT METHODS
+    @db_safe()
     async def create_user(self, telegram_id: int, aptos_address: str = None, referral_code: str = None) -> Optional[int]:
         """Create new user and return user ID"""
-        try:
-            cursor = await self.execute(
-                "INSERT INTO users (telegram_id, aptos_address, referral_code) VALUES (?, ?, ?)",
-                (telegram_id, aptos_address, referral_code)
-            )
-            return cursor.lastrowid if cursor else None
-        except Exception as e:
-            logger.error(f"Create user error: {e}")
-            return None
+        cursor = await self.execute(
+            "INSERT INTO users (telegram_id, aptos_address, referral_code) VALUES (?, ?, ?)",
+            (telegram_id, aptos_address, referral_code)
+        )
+        return cursor.lastrowid if cursor else None
     
+    @db_safe()
     async def get_user_by_telegram_id(self, telegram_id: int) -> Optional[Dict]:
         """Get user by Telegram ID"""
+        row = await self.fetchone(
+            "SELECT * FROM users WHERE telegram_id = ?", 
+            (telegram_id,)
+        )
+        if not row:
+            return None
+        # Single keys are cheaper through get_user_config_field; a full record gets a parsed config
+        user = dict(row)
+        user['config'] = json.loads(user['config']) if user.get('config') else {}
+        return user
+    
+    async def get_user_config_field(self, telegram_id: int, field: str, default=None) -> Any:
+        """Read one (dot-separated) key from a user's JSON config without loading the whole document"""
         try:
+            path = "$." + field
             row = await self.fetchone(
-                "SELECT * FROM users WHERE telegram_id = ?", 
-                (telegram_id,)
+                "SELECT json_type(config, ?), json_extract(config, ?) FROM users WHERE telegram_id = ?",
+                (path, path, telegram_id)
             )
-            if row:
-                return {
-                    'id': row[0],
-                    'telegram_id': row[1],
-                    'aptos_address': row[2],
-                    'wallet_address': row[3],
-                    'wallet_private_key': row[4],
-                    'status': row[5],
-                    'config': json.loads(row[6]) if row[6] else {},
-                    'referral_code': row[7],
-                    'referred_by': row[8],
-                    'created_at': row[9],
-                    'last_active': row[10]
-                }
-            return None
+            if not row or row[1] is None:
+                return default
+            # json_extract hands back objects and arrays as JSON text and booleans as 1/0
+            if row[0] in ('object', 'array'):
+                return json.loads(row[1])
+            if row[0] in ('true', 'false'):
+                return row[0] == 'true'
+            return row[1]
         except Exception as e:
-            logger.error(f"Get user error: {e}")
-            return None
+            logger.error(f"Get user config field error: {e}")
+            return default
     
+    @db_safe(False)
     async def update_user_status(self, user_id: int, status: str) -> bool:
         """Update user status"""
-        try:
+        # last_active only needs minute resolution - skip rewriting it on rapid status changes
+        now = time.monotonic()
+        last_written = self._last_active_written.get(user_id)
+        if last_written is not None and now - last_written < self.LAST_ACTIVE_INTERVAL:
             cursor = await self.execute(
-                "UPDATE users SET status = ?, last_active = CURRENT_TIMESTAMP WHERE id = ?",
+                "UPDATE users SET status = ? WHERE id = ?",
                 (status, user_id)
             )
             return cursor is not None
-        except Exception as e:
-            logger.error(f"Update user status error: {e}")
-            return False
+        
+        cursor = await self.execute(
+            "UPDATE users SET status = ?, last_active = CURRENT_TIMESTAMP WHERE id = ?",
+            (status, user_id)
+        )
+        if cursor is not None:
+            self._last_active_written[user_id] = now
+        return cursor is not None
     
+    @db_safe(False)
     async def update_user_wallet(self, user_id: int, wallet_address: str, wallet_private_key: str) -> bool:
         """Update user's Aptos wallet info"""
-        try:
-            cursor = await self.execute(
-                "UPDATE users SET wallet_address = ?, wallet_private_key = ? WHERE id = ?",
-                (wallet_address, wallet_private_key, user_id)
-            )
-            return cursor is not None
-        except Exception as e:
-            logger.error(f"Update Aptos wallet error: {e}")
-            return False
+        cursor = await self.execute(
+            "UPDATE users SET wallet_address = ?, wallet_private_key = ? WHERE id = ?",
+            (wallet_address, wallet_private_key, user_id)
+        )
+        return cursor is not None
     
     # TRADING METHODS
+    @db_safe(False)
     async def log_trade(self, user_id: int, strategy: str, coin: str, trade_type: str, 
                        amount: float, price: float, fee: float = 0, order_id: str = None, 
                        transaction_hash: str = None, dex_name: str = None) -> bool:
         """Log an Aptos trade to database"""
-        try:
-            cursor = await self.execute(
-                """INSERT INTO user_trades 
-                   (user_id, strategy, coin, trade_type, amount, price, fee, order_id, transaction_hash, dex_name) 
-                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-                (user_id, strategy, coin, trade_type, amount, price, fee, order_id, transaction_hash, dex_name)
-            )
-            return cursor is not None
-        except Exception as e:
-            logger.error(f"Log Aptos trade error: {e}")
-            return False
+        cursor = await self.execute(
+            _INSERT_TRADE_SQL,
+            (user_id, strategy, coin, trade_type, amount, price, fee, order_id, transaction_hash, dex_name)
+        )
+        return cursor is not None
+    
+    async def _insert_many(self, sql: str, rows: List[tuple]) -> int:
+        """Insert rows with one prepared statement and a single commit; returns rows written"""
+        if not rows:
+            return 0
+        async with self.transaction():
+            await self.conn.executemany(sql, rows)
+        return len(rows)
+    
+    @db_safe(0)
+    async def log_trades_bulk(self, rows: List[tuple]) -> int:
+        """
+        Log many trades at once
+        Each row is (user_id, strategy, coin, trade_type, amount, price, fee, order_id, transaction_hash, dex_name)
+        """
+        return await self._insert_many(_INSERT_TRADE_SQL, rows)
     
+    @db_safe([])
     async def get_user_trades(self, user_id: int, limit: int = 100) -> List[Dict]:
         """Get user's recent trades"""
-        try:
-            rows = await self.fetchall(
-                """SELECT * FROM user_trades 
-                   WHERE user_id = ? 
-                   ORDER BY timestamp DESC 
-                   LIMIT ?""",
-                (user_id, limit)
-            )
-            
-            trades = []
-            for row in rows:
-                trades.append({
-                    'id': row[0],
-                    'strategy': row[2],
-                    'coin': row[3],
-                    'trade_type': row[4],
-                    'amount': row[5],
-                    'price': row[6],
-                    'fee': row[7],
-                    'timestamp': row[8],
-                    'pnl': row[9],
-                    'order_id': row[10],
-                    'transaction_hash': row[11],
-                    'dex_name': row[12],
-                    'status': row[13]
-                })
-            return trades
-        except Exception as e:
-            logger.error(f"Get user trades error: {e}")
-            return []
+        rows = await self.fetchall(
+            """SELECT id, strategy, coin, trade_type, amount, price, fee, timestamp,
+                      pnl, order_id, transaction_hash, dex_name, status
+               FROM user_trades 
+               WHERE user_id = ? 
+               ORDER BY timestamp DESC 
+               LIMIT ?""",
+            (user_id, limit)
+        )
+        return [dict(row) for row in rows]
     
+    @db_safe(False)
     async def update_trade_pnl(self, trade_id: int, pnl: float) -> bool:
         """Update trade PnL"""
-        try:
-            cursor = await self.execute(
-                "UPDATE user_trades SET pnl = ? WHERE id = ?",
-                (pnl, trade_id)
-            )
-            return cursor is not None
-        except Exception as e:
-            logger.error(f"Update trade PnL error: {e}")
-            return False
+        cursor = await self.execute(
+            "UPDATE user_trades SET pnl = ? WHERE id = ?",
+            (pnl, trade_id)
+        )
+        return cursor is not None
     
     # APTOS DEFI ACTIVITY TRACKING
+    @db_safe(False)
     async def log_aptos_defi_activity(self, user_id: int, activity_type: str, 
                                      protocol_name: str, amount_apt: float = 0,
                                      transaction_hash: str = None, rewards_earned: float = 0,
                                      dex_name: str = None, pool_address: str = None) -> bool:
         """Log Aptos DeFi activity for rewards tracking"""
-        try:
-            cursor = await self.execute(
-                """INSERT INTO aptos_defi_activity 
-                   (user_id, activity_type, protocol_name, amount_apt, transaction_hash, rewards_earned, dex_name, pool_address) 
-                   VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
-                (user_id, activity_type, protocol_name, amount_apt, transaction_hash, rewards_earned, dex_name, pool_address)
-            )
-            return cursor is not None
-        except Exception as e:
-            logger.error(f"Log Aptos DeFi activity error: {e}")
-            return False
+        cursor = await self.execute(
+            _INSERT_DEFI_SQL,
+            (user_id, activity_type, protocol_name, amount_apt, transaction_hash, rewards_earned, dex_name, pool_address)
+        )
+        return cursor is not None
+    
+    @db_safe(0)
+    async def log_defi_activities_bulk(self, rows: List[tuple]) -> int:
+        """
+        Log many DeFi activities at once
+        Each row is (user_id, activity_type, protocol_name, amount_apt, transaction_hash, rewards_earned, dex_name, pool_address)
+        """
+        return await self._insert_many(_INSERT_DEFI_SQL, rows)
     
+    @db_safe({'total_transactions': 0, 'total_volume_apt': 0, 'total_rewards': 0, 'unique_protocols': 0, 'unique_dexs': 0})
     async def get_user_aptos_defi_stats(self, user_id: int) -> Dict:
         """Get user's Aptos DeFi activity stats"""
-        try:
-            # Total transactions
-            total_tx = await self.fetchone(
-                "SELECT COUNT(*) FROM aptos_defi_activity WHERE user_id = ?",
-                (user_id,)
-            )
-            
-            # Total volume
-            total_volume = await self.fetchone(
-                "SELECT SUM(amount_apt) FROM aptos_defi_activity WHERE user_id = ?",
-                (user_id,)
-            )
-            
-            # Total rewards
-            total_rewards = await self.fetchone(
-                "SELECT SUM(rewards_earned) FROM aptos_defi_activity WHERE user_id = ?",
-                (user_id,)
-            )
-            
-            # Unique protocols
-            unique_protocols = await self.fetchone(
-                "SELECT COUNT(DISTINCT protocol_name) FROM aptos_defi_activity WHERE user_id = ?",
-                (user_id,)
-            )
-            
-            # Unique DEXs
-            unique_dexs = await self.fetchone(
-                "SELECT COUNT(DISTINCT dex_name) FROM aptos_defi_activity WHERE user_id = ? AND dex_name IS NOT NULL",
-                (user_id,)
-            )
-            
-            return {
-                'total_transactions': total_tx[0] if total_tx else 0,
-                'total_volume_apt': total_volume[0] if total_volume and total_volume[0] else 0,
-                'total_rewards': total_rewards[0] if total_rewards and total_rewards[0] else 0,
-                'unique_protocols': unique_protocols[0] if unique_protocols else 0,
-                'unique_dexs': unique_dexs[0] if unique_dexs else 0
-            }
-        except Exception as e:
-            logger.error(f"Get Aptos DeFi stats error: {e}")
+        # All five aggregates in one pass over the user's rows
+        row = await self.fetchone(
+            """SELECT COUNT(*),
+                      COALESCE(SUM(amount_apt), 0),
+                      COALESCE(SUM(rewards_earned), 0),
+                      COUNT(DISTINCT protocol_name),
+                      COUNT(DISTINCT dex_name)
+               FROM aptos_defi_activity WHERE user_id = ?""",
+            (user_id,)
+        )
+        if not row:
             return {'total_transactions': 0, 'total_volume_apt': 0, 'total_rewards': 0, 'unique_protocols': 0, 'unique_dexs': 0}
+        
+        return {
+            'total_transactions': row[0],
+            'total_volume_apt': row[1],
+            'total_rewards': row[2],
+            'unique_protocols': row[3],
+            'unique_dexs': row[4]
+        }
     
     # PERFORMANCE TRACKING
+    @db_safe(False)
     async def update_daily_performance(self, user_id: int, date: str, total_pnl: float, 
                                      volume_apt: float, trades_count: int, account_value: float,
                                      gas_used: float = 0, strategy: str = None) -> bool:
         """Update daily performance metrics for Aptos"""
-        try:
-            # Check if record exists
-            existing = await self.fetchone(
-                "SELECT id FROM trading_performance WHERE user_id = ? AND date = ?",
-                (user_id, date)
-            )
-            
-            if existing:
-                # Update existing record
-                cursor = await self.execute(
-                    """UPDATE trading_performance 
-                       SET total_pnl = ?, volume_apt = ?, trades_count = ?, account_value = ?, gas_used = ?, strategy = ?
-                       WHERE user_id = ? AND date = ?""",
-                    (total_pnl, volume_apt, trades_count, account_value, gas_used, strategy, user_id, date)
-                )
-            else:
-                # Insert new record
-                cursor = await self.execute(
-                    """INSERT INTO trading_performance 
-                       (user_id, date, total_pnl, volume_apt, trades_count, account_value, gas_used, strategy)
-                       VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
-                    (user_id, date, total_pnl, volume_apt, trades_count, account_value, gas_used, strategy)
-                )
-            
-            return cursor is not None
-        except Exception as e:
-            logger.error(f"Update daily performance error: {e}")
-            return False
+        # Insert or overwrite the day's row in one atomic statement
+        cursor = await self.execute(
+            """INSERT INTO trading_performance 
+               (user_id, date, total_pnl, volume_apt, trades_count, account_value, gas_used, strategy)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+               ON CONFLICT (user_id, date) DO UPDATE SET
+                   total_pnl = excluded.total_pnl, volume_apt = excluded.volume_apt,
+                   trades_count = excluded.trades_count, account_value = excluded.account_value,
+                   gas_used = excluded.gas_used, strategy = excluded.strategy""",
+            (user_id, date, total_pnl, volume_apt, trades_count, account_value, gas_used, strategy)
+        )
+        
+        return cursor is not None
     
+    @db_safe({'daily_profit': 0, 'daily_volume': 0, 'daily_trades': 0})
     async def get_user_performance(self, user_id: int, days: int = 1) -> Dict:
         """Get user performance for vault stats (last 24h by default)"""
-        try:
-            rows = await self.fetchall(
-                """SELECT total_pnl, volume_apt, trades_count 
-                   FROM trading_performance 
-                   WHERE user_id = ? 
-                   ORDER BY date DESC 
-                   LIMIT ?""",
-                (user_id, days)
-            )
-            
-            if not rows:
-                return {'daily_profit': 0, 'daily_volume': 0, 'daily_trades': 0}
-            
-            # Return most recent day's performance
-            return {
-                'daily_profit': rows[0][0] or 0,
-                'daily_volume': rows[0][1] or 0,
-                'daily_trades': rows[0][2] or 0
-            }
-        except Exception as e:
-            logger.error(f"Error getting user performance: {e}")
+        rows = await self.fetchall(
+            """SELECT total_pnl, volume_apt, trades_count 
+               FROM trading_performance 
+               WHERE user_id = ? 
+               ORDER BY date DESC 
+               LIMIT ?""",
+            (user_id, days)
+        )
+        
+        if not rows:
             return {'daily_profit': 0, 'daily_volume': 0, 'daily_trades': 0}
+        
+        # Return most recent day's performance
+        return {
+            'daily_profit': rows[0][0] or 0,
+            'daily_volume': rows[0][1] or 0,
+            'daily_trades': rows[0][2] or 0
+        }
     
+    @db_safe({'total_pnl': 0, 'total_volume': 0, 'total_trades': 0, 'current_value': 0, 'total_gas_used': 0, 'daily_data': []})
     async def get_user_performance_summary(self, user_id: int, days: int = 30) -> Dict:
         """Get user performance summary for last N days"""
-        try:
-            rows = await self.fetchall(
-                """SELECT date, total_pnl, volume_apt, trades_count, account_value, gas_used 
-                   FROM trading_performance 
-                   WHERE user_id = ? 
-                   ORDER BY date DESC 
-                   LIMIT ?""",
-                (user_id, days)
-            )
-            
-            if not rows:
-                return {'total_pnl': 0, 'total_volume': 0, 'total_trades': 0, 'current_value': 0, 'total_gas_used': 0, 'daily_data': []}
-            
-            total_pnl = sum(row[1] for row in rows if row[1])
-            total_volume = sum(row[2] for row in rows if row[2])
-            total_trades = sum(row[3] for row in rows if row[3])
-            current_value = rows[0][4] if rows[0][4] else 0
-            total_gas_used = sum(row[5] for row in rows if row[5])
-            
-            daily_data = []
-            for row in rows:
-                daily_data.append({
-                    'date': row[0],
-                    'pnl': row[1] or 0,
-                    'volume': row[2] or 0,
-                    'trades': row[3] or 0,
-                    'account_value': row[4] or 0,
-                    'gas_used': row[5] or 0
-                })
-            
-            return {
-                'total_pnl': total_pnl,
-                'total_volume': total_volume,
-                'total_trades': total_trades,
-                'current_value': current_value,
-                'total_gas_used': total_gas_used,
-                'daily_data': daily_data
-            }
-        except Exception as e:
-            logger.error(f"Get performance summary error: {e}")
+        # Totals are summed in SQL over the same last-N-days window as the breakdown
+        totals = await self.fetchone(
+            """SELECT COALESCE(SUM(total_pnl), 0), COALESCE(SUM(volume_apt), 0),
+                      COALESCE(SUM(trades_count), 0), COALESCE(SUM(gas_used), 0)
+               FROM (SELECT total_pnl, volume_apt, trades_count, gas_used
+                     FROM trading_performance 
+                     WHERE user_id = ? 
+                     ORDER BY date DESC 
+                     LIMIT ?)""",
+            (user_id, days)
+        )
+        rows = await self.fetchall(
+            """SELECT date, total_pnl, volume_apt, trades_count, account_value, gas_used 
+               FROM trading_performance 
+               WHERE user_id = ? 
+               ORDER BY date DESC 
+               LIMIT ?""",
+            (user_id, days)
+        )
+        
+        if not rows or not totals:
             return {'total_pnl': 0, 'total_volume': 0, 'total_trades': 0, 'current_value': 0, 'total_gas_used': 0, 'daily_data': []}
+        
+        daily_data = [
+            {
+                'date': row[0],
+                'pnl': row[1] or 0,
+                'volume': row[2] or 0,
+                'trades': row[3] or 0,
+                'account_value': row[4] or 0,
+                'gas_used': row[5] or 0
+            }
+            for row in rows
+        ]
+        
+        return {
+            'total_pnl': totals[0],
+            'total_volume': totals[1],
+            'total_trades': totals[2],
+            'current_value': rows[0][4] or 0,
+            'total_gas_used': totals[3],
+            'daily_data': daily_data
+        }
     
     # VAULT MANAGEMENT
     async def add_vault_user(self, user_id: int, vault_address: str, deposit_amount: float) -> bool:
         """Add user to vault"""
-        try:
-            cursor = await self.execute(
-                """INSERT INTO vault_users 
-                   (user_id, vault_address, deposit_amount, current_balance) 
-                   VALUES (?, ?, ?, ?)""",
-                (user_id, vault_address, deposit_amount, deposit_amount)
-            )
-            return cursor is not None
-        except Exception as e:
-            logger.error(f"Add vault user error: {e}")
-            return False
+        # A user holds at most one active record per vault, so this is a deposit
+        return await self.record_vault_deposit(user_id, vault_address, deposit_amount)
     
+    @db_safe([])
     async def get_vault_users(self, vault_address: str) -> List[Dict]:
         """Get all users in a vault"""
-        try:
-            rows = await self.fetchall(
-                "SELECT * FROM vault_users WHERE vault_address = ? AND status = 'active'",
-                (vault_address,)
-            )
-            
-            users = []
-            for row in rows:
-                users.append({
-                    'user_id': row[1],
-                    'deposit_amount': row[3],
-                    'deposit_time': row[4],
-                    'current_balance': row[7],
-                    'profit_share': row[8]
-                })
-            return users
-        except Exception as e:
-            logger.error(f"Get vault users error: {e}")
-            return []
+        rows = await self.fetchall(
+            """SELECT user_id, deposit_amount, deposit_time, current_balance, profit_share
+               FROM vault_users WHERE vault_address = ? AND status = 'active'""",
+            (vault_address,)
+        )
+        return [dict(row) for row in rows]
     
     # REFERRAL SYSTEM
+    @db_safe(False)
     async def log_referral_commission(self, referrer_id: int, referee_id: int, 
                                     commission_amount: float, volume_generated: float) -> bool:
         """Log referral commission"""
-        try:
-            cursor = await self.execute(
-                """INSERT INTO referral_commissions 
-                   (referrer_id, referee_id, commission_amount, volume_generated) 
-                   VALUES (?, ?, ?, ?)""",
-                (referrer_id, referee_id, commission_amount, volume_generated)
-            )
-            return cursor is not None
-        except Exception as e:
-            logger.error(f"Log referral commission error: {e}")
-            return False
+        cursor = await self.execute(
+            _INSERT_REFERRAL_SQL,
+            (referrer_id, referee_id, commission_amount, volume_generated)
+        )
+        return cursor is not None
     
+    @db_safe(0)
+    async def log_referral_commissions_bulk(self, rows: List[tuple]) -> int:
+        """
+        Log many referral commissions at once
+        Each row is (referrer_id, referee_id, commission_amount, volume_generated)
+        """
+        return await self._insert_many(_INSERT_REFERRAL_SQL, rows)
+    
+    @db_safe({'total_commission': 0, 'total_volume': 0, 'referee_count': 0})
     async def get_user_referral_stats(self, user_id: int) -> Dict:
         """Get user's referral statistics"""
-        try:
-            total_commission = await self.fetchone(
-                "SELECT SUM(commission_amount) FROM referral_commissions WHERE referrer_id = ?",
-                (user_id,)
-            )
-            
-            total_volume = await self.fetchone(
-                "SELECT SUM(volume_generated) FROM referral_commissions WHERE referrer_id = ?",
-                (user_id,)
-            )
-            
-            referee_count = await self.fetchone(
-                "SELECT COUNT(DISTINCT referee_id) FROM referral_commissions WHERE referrer_id = ?",
-                (user_id,)
-            )
-            
-            return {
-                'total_commission': total_commission[0] if total_commission and total_commission[0] else 0,
-                'total_volume': total_volume[0] if total_volume and total_volume[0] else 0,
-                'referee_count': referee_count[0] if referee_count else 0
-            }
-        except Exception as e:
-            logger.error(f"Get referral stats error: {e}")
+        row = await self.fetchone(
+            """SELECT COALESCE(SUM(commission_amount), 0),
+                      COALESCE(SUM(volume_generated), 0),
+                      COUNT(DISTINCT referee_id)
+               FROM referral_commissions WHERE referrer_id = ?""",
+            (user_id,)
+        )
+        if not row:
             return {'total_commission': 0, 'total_volume': 0, 'referee_count': 0}
+        
+        return {
+            'total_commission': row[0],
+            'total_volume': row[1],
+            'referee_count': row[2]
+        }
     
+    @db_safe(False)
     async def record_vault_deposit(self, user_id: int, vault_address: str, amount: float) -> bool:
         """Record a vault deposit"""
-        try:
-            # Check if user already has a vault record
-            existing = await self.fetchone(
-                "SELECT id, current_balance FROM vault_users WHERE user_id = ? AND vault_address = ? AND status = 'active'",
-                (user_id, vault_address)
-            )
-            
-            if existing:
-                # Update existing record
-                new_balance = existing[1] + amount
-                await self.execute(
-                    "UPDATE vault_users SET current_balance = ?, deposit_amount = deposit_amount + ? WHERE id = ?",
-                    (new_balance, amount, existing[0])
-                )
-            else:
-                # Create new record
-                await self.execute(
-                    "INSERT INTO vault_users (user_id, vault_address, deposit_amount, current_balance) VALUES (?, ?, ?, ?)",
-                    (user_id, vault_address, amount, amount)
-                )
-            
-            return True
-        except Exception as e:
-            logger.error(f"Error recording vault deposit: {e}")
-            return False
+        # Open the active vault record, or top up the existing one
+        cursor = await self.execute(
+            """INSERT INTO vault_users (user_id, vault_address, deposit_amount, current_balance) VALUES (?, ?, ?, ?)
+               ON CONFLICT (user_id, vault_address) WHERE status = 'active' DO UPDATE SET
+                   current_balance = current_balance + excluded.deposit_amount,
+                   deposit_amount = deposit_amount + excluded.deposit_amount""",
+            (user_id, vault_address, amount, amount)
+        )
+        
+        return cursor is not None
     
+    @db_safe(False)
     async def record_vault_withdrawal(self, user_id: int, vault_address: str, amount: float) -> bool:
         """Record a vault withdrawal"""
-        try:
-            # Update vault record
-            await self.execute(
-                """UPDATE vault_users 
-                   SET current_balance = current_balance - ?, 
-                       withdrawal_amount = withdrawal_amount + ?,
-                       withdrawal_time = CURRENT_TIMESTAMP
-                   WHERE user_id = ? AND vault_address = ? AND status = 'active'""",
-                (amount, amount, user_id, vault_address)
-            )
-            return True
-        except Exception as e:
-            logger.error(f"Error recording vault withdrawal: {e}")
-            return False
+        # Update vault record
+        await self.execute(
+            """UPDATE vault_users 
+               SET current_balance = current_balance - ?, 
+                   withdrawal_amount = withdrawal_amount + ?,
+                   withdrawal_time = CURRENT_TIMESTAMP
+               WHERE user_id = ? AND vault_address = ? AND status = 'active'""",
+            (amount, amount, user_id, vault_address)
+        )
+        return True
     
+    @db_safe(0.0)
     async def get_user_vault_balance(self, user_id: int, vault_address: str) -> float:
         """Get user's current vault balance from database"""
-        try:
-            result = await self.fetchone(
-                "SELECT current_balance FROM vault_users WHERE user_id = ? AND vault_address = ? AND status = 'active'",
-                (user_id, vault_address)
-            )
-            return result[0] if result else 0.0
-        except Exception as e:
-            logger.error(f"Error getting vault balance: {e}")
-            return 0.0
+        result = await self.fetchone(
+            "SELECT current_balance FROM vault_users WHERE user_id = ? AND vault_address = ? AND status = 'active'",
+            (user_id, vault_address)
+        )
+        return result[0] if result else 0.0
     
     async def close(self):
-        """Close database connection"""
+        """
+        Close database connection
+        Call only at shutdown, once no requests are in flight - the connection is shared by all of them
+        """
+        if self._optimize_task is not None:
+            self._optimize_task.cancel()
+            self._optimize_task = None
+        if self._readers is not None:
+            await self._close_readers(self._readers)
+            self._readers = None
         if self.conn:
+            # Recommended before closing a long-lived connection
+            await self._optimize()
             await self.conn.close()
+            self.conn = None
+            self._initialized = False
             logger.info("Database connection closed")
 
 # Create global database instance
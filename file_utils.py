@@ -0,0 +1,75 @@
+"""
+File helpers shared by the config loaders
+"""
+
+import json
+import os
+import stat
+import threading
+from typing import Any, Dict
+
+from cachetools import LRUCache
+
+# orjson is optional - stdlib json is the fallback codec
+try:
+    import orjson
+    
+    _loads = orjson.loads
+    _dumps = orjson.dumps
+except ImportError:
+    _loads = json.loads
+    
+    def _dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode()
+
+# Parsed shared config files keyed by path: ((st_mtime_ns, st_size), parsed value).
+# Bounded, and guarded because loads also run on executor threads
+_PARSE_CACHE_SIZE = 16
+_PARSE_CACHE = LRUCache(maxsize=_PARSE_CACHE_SIZE)
+_PARSE_CACHE_LOCK = threading.Lock()
+
+def load_json(path: str) -> Dict[str, Any]:
+    """Load a JSON file without caching it (for per-user and other one-off files)"""
+    with open(path, 'rb') as f:
+        return _loads(f.read())
+
+def load_json_cached(path: str) -> Dict[str, Any]:
+    """
+    Load a shared JSON config file, reusing the previous parse while the file is unchanged
+    Returns a private copy so callers may mutate the result
+    Raises FileNotFoundError if path does not exist (the stat doubles as the existence check)
+    """
+    st = os.stat(path)
+    stamp = (st.st_mtime_ns, st.st_size)
+    with _PARSE_CACHE_LOCK:
+        cached = _PARSE_CACHE.get(path)
+    if cached is not None and cached[0] == stamp:
+        # Re-encoding a parsed tree is much cheaper than copy.deepcopy
+        return _loads(_dumps(cached[1]))
+    
+    with open(path, 'rb') as f:
+        data = f.read()
+    parsed = _loads(data)
+    with _PARSE_CACHE_LOCK:
+        _PARSE_CACHE[path] = (stamp, parsed)
+    return _loads(data)
+
+def write_atomic(path: str, data: bytes):
+    """
+    Replace path with data via a temp file and os.replace
+    The temp file is fsynced before the rename and takes over the permission
+    bits of the file it replaces, so a chmod 600 key file stays private
+    """
+    try:
+        mode = stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        mode = None
+    
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'wb') as f:
+        if mode is not None:
+            os.fchmod(f.fileno(), mode)
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
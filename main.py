@@ -114,6 +114,12 @@ class AptosAlphaBot:
         try:
             logger.info("🔧 Initializing AptosAlphaBot components...")
             
+            # Warm the user config cache in one batch, off the event loop
+            try:
+                await asyncio.get_running_loop().run_in_executor(None, self.config_manager.preload_all)
+            except Exception as e:
+                logger.warning(f"User config preload failed: {e}")
+            
             # 1. Initialize Aptos Database
             logger.info("📚 Initializing Aptos database...")
             try:
@@ -139,9 +145,8 @@ class AptosAlphaBot:
                 )
                 
                 # Connect and get components
-                address, info, exchange = await self.aptos_auth.connect()
-                self.aptos_info = info
-                self.aptos_exchange = exchange
+                address = await self.aptos_auth.connect()
+                self.aptos_info = self.aptos_auth.info
                 
                 logger.info(f"✅ Aptos authentication successful: {address}")
                 
@@ -172,6 +177,7 @@ class AptosAlphaBot:
                     logger.info("✅ Aptos Exchange reinitialized with sponsor integrations (Panora enabled)")
                 except Exception as config_error:
                     logger.warning(f"Could not reload config for integrations: {config_error}")
+                    self.aptos_exchange = self.aptos_auth.exchange
                 
                 # Initialize sponsor integrations - Perpetuals
                 logger.info("🚀 Initializing sponsor perpetuals integrations...")
@@ -503,6 +509,10 @@ class AptosAlphaBot:
             if self.database and hasattr(self.database, 'close') and asyncio.iscoroutinefunction(self.database.close):
                 await self.database.close()
             
+            # Write any pending user preference changes
+            if self.config_manager:
+                self.config_manager.flush()
+            
             logger.info("✅ Bot stopped successfully")
             
         except Exception as e:
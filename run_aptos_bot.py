@@ -60,7 +60,8 @@ async def main():
         from aptos_auth import AptosAuth
         
         auth = AptosAuth(network=network)
-        address, info, exchange = await auth.connect()
+        address = await auth.connect()
+        info = auth.info
         
         print(f"✅ Aptos connection successful!")
         print(f"Address: {address}")
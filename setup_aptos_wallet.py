@@ -175,7 +175,8 @@ async def test_connection(config_path, network="testnet"):
         )
         
         # Connect
-        address, info, exchange = await auth.connect()
+        address = await auth.connect()
+        info = auth.info
         
         print(f"✅ Connection successful!")
         print(f"Address: {address}")
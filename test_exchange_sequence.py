@@ -0,0 +1,83 @@
+"""
+Tests for the locally tracked sequence number in AptosExchange
+"""
+
+import asyncio
+
+import pytest
+
+pytest.importorskip("aptos_sdk")
+
+from aptos_sdk.account import Account
+from aptos_sdk.transactions import EntryFunction, TransactionPayload
+
+from aptos.exchange import AptosExchange, BatchSubmissionError
+
+CHAIN_SEQUENCE_NUMBER = 7
+
+
+class FakeClient:
+    """Node client that records submitted sequence numbers and can fail chosen submits"""
+
+    base_url = "http://localhost:8080/v1"
+
+    def __init__(self, fail_submits=()):
+        self.fail_submits = set(fail_submits)
+        self.submit_calls = 0
+        self.submitted = []
+
+    async def account_sequence_number(self, address):
+        return CHAIN_SEQUENCE_NUMBER + len(self.submitted)
+
+    async def chain_id(self):
+        return 2
+
+    async def submit_bcs_transaction(self, signed_txn):
+        self.submit_calls += 1
+        if self.submit_calls in self.fail_submits:
+            raise asyncio.TimeoutError()
+        self.submitted.append(signed_txn.transaction.sequence_number)
+        return f"0x{self.submit_calls:064x}"
+
+    async def wait_for_transaction(self, txn_hash):
+        return None
+
+
+def _payload():
+    return TransactionPayload(EntryFunction.natural("0x1::aptos_account", "transfer", [], []))
+
+
+def test_failed_submit_does_not_leave_a_sequence_gap():
+    async def run():
+        client = FakeClient(fail_submits={1})
+        exchange = AptosExchange(Account.generate(), client=client)
+
+        with pytest.raises(asyncio.TimeoutError):
+            await exchange._submit_only(_payload())
+        await exchange._submit_only(_payload())
+
+        assert client.submitted == [CHAIN_SEQUENCE_NUMBER]
+        assert exchange._seq_outstanding == 0
+
+    asyncio.run(run())
+
+
+def test_submit_many_stops_at_first_failure_and_reports_sent_hashes():
+    async def run():
+        client = FakeClient(fail_submits={2})
+        exchange = AptosExchange(Account.generate(), client=client)
+
+        with pytest.raises(BatchSubmissionError) as excinfo:
+            await exchange.submit_many([_payload(), _payload(), _payload()])
+
+        # The third transaction is never sent behind the failed second one
+        assert client.submit_calls == 2
+        assert client.submitted == [CHAIN_SEQUENCE_NUMBER]
+        assert len(excinfo.value.txn_hashes) == 1
+        assert exchange._seq_outstanding == 0
+
+        # Every unsent number was handed back, so the counter resyncs from chain
+        await exchange._submit_only(_payload())
+        assert client.submitted == [CHAIN_SEQUENCE_NUMBER, CHAIN_SEQUENCE_NUMBER + 1]
+
+    asyncio.run(run())